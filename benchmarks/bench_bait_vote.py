@@ -0,0 +1,163 @@
+"""
+False bite triggers versus confirmation latency of the bait-count vote
+(BaitCountFilter), against the previous rule of reeling in on the first read
+below the initial count.
+
+Each --vote N/M setting replays the same stream of readings the way
+_wait_for_bite polls them: a wait starts by confirming the count, a bite is
+declared when the confirmed count drops, and the next wait starts over.
+Declared bites are scored against the true count drops:
+  - recorded sessions (a PNG directory or video, read at the current
+    detector threshold): truth is a centered running median of the readings,
+    which sees the future and so is not fooled by isolated misreads
+  - --synthetic: a generated count with random misreads and unreadable frames
+
+Run from the project root:
+    python -m benchmarks.bench_bait_vote <png-directory|video-file> [--vote 2/3 --vote 3/5]
+    python -m benchmarks.bench_bait_vote --synthetic 20000 [--misread 0.02]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.bait_filter import BaitCountFilter
+from src.capture import Frame, open_replay_backend
+from src.config import cfg
+from src.digit_recognizer import DigitReading
+from src.vision import vision
+
+# Reads of the centered median that defines the replay truth
+ORACLE_WIDTH = 9
+
+
+def replay_readings(path):
+    backend = open_replay_backend(path)
+    cfg.set_screen_size(*backend.screen_size())
+    region = cfg.get_rect('bait_count')
+    threshold = cfg.get_detector('bait_count')['threshold']
+    readings = []
+    for _ in range(len(backend)):
+        image = backend.grab(None)
+        frame = Frame(image, (0, 0, image.shape[1], image.shape[0]), time.time())
+        readings.append(vision.read_bait_count(region, threshold, frame))
+    backend.close()
+    return readings
+
+
+def oracle(readings):
+    """Centered running median of the readable values, carried over unreadable frames."""
+    values = np.array([np.nan if r.value is None else r.value for r in readings])
+    half = ORACLE_WIDTH // 2
+    truth, last = [], None
+    for i in range(len(values)):
+        window = values[max(i - half, 0):i + half + 1]
+        window = window[~np.isnan(window)]
+        if len(window):
+            last = int(np.median(window))
+        truth.append(last)
+    return truth
+
+
+def synthetic_readings(count, misread, unreadable, bite_every, seed=0):
+    """Returns (readings, truth): one bait used every ~`bite_every` reads."""
+    rng = np.random.default_rng(seed)
+    value, truth, readings = 99, [], []
+    for _ in range(count):
+        if rng.random() < 1 / bite_every and value > 0:
+            value -= 1
+        truth.append(value)
+        roll = rng.random()
+        if roll < unreadable:
+            readings.append(DigitReading(None, 0.0))
+        elif roll < unreadable + misread:
+            # One digit misread, scored lower than a clean read
+            wrong = value - value % 10 + (value % 10 + int(rng.integers(1, 10))) % 10
+            readings.append(DigitReading(wrong, float(rng.uniform(0.7, 0.88))))
+        else:
+            readings.append(DigitReading(value, float(rng.uniform(0.85, 0.99))))
+    return readings, truth
+
+
+def declare_first_read(readings):
+    """The previous rule: baseline is the first readable value, a bite is any lower read."""
+    bites, baseline = [], None
+    for i, r in enumerate(readings):
+        if r.value is None:
+            continue
+        if baseline is None:
+            baseline = r.value
+        elif r.value < baseline:
+            bites.append(i)
+            baseline = None  # the next wait starts after reeling in
+    return bites
+
+
+def declare_voted(readings, votes, window):
+    bait_filter = BaitCountFilter(votes, window)
+    bites, baseline = [], None
+    for i, r in enumerate(readings):
+        value = bait_filter.update(r)
+        if value is None:
+            continue
+        if baseline is None:
+            baseline = value
+        elif value < baseline:
+            bites.append(i)
+            bait_filter.reset()
+            baseline = None
+    return bites
+
+
+def score(bites, truth):
+    """Returns (true positives, false positives, missed drops, latencies in reads)."""
+    drops = [i for i in range(1, len(truth)) if truth[i] is not None and truth[i - 1] is not None
+             and truth[i] < truth[i - 1]]
+    bounds = drops + [len(truth)]
+    latencies, matched = [], set()
+    for bite in bites:
+        # Attribute the bite to the latest drop at or before it
+        k = np.searchsorted(drops, bite, side='right') - 1
+        if k >= 0 and bite < bounds[k + 1] and k not in matched:
+            matched.add(k)
+            latencies.append(bite - drops[k])
+    return len(matched), len(bites) - len(matched), len(drops) - len(matched), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('path', nargs='?', help="directory of PNG screenshots or a video file")
+    parser.add_argument('--synthetic', type=int, default=0, help="generate this many reads instead")
+    parser.add_argument('--misread', type=float, default=0.02, help="synthetic misread probability")
+    parser.add_argument('--unreadable', type=float, default=0.03, help="synthetic unreadable probability")
+    parser.add_argument('--bite-every', type=float, default=150, help="synthetic reads per bait used")
+    parser.add_argument('--vote', action='append', default=None, help="N/M setting, repeatable (default 2/3 3/5)")
+    parser.add_argument('--interval', type=float, default=0.2, help="seconds between reads in _wait_for_bite")
+    args = parser.parse_args()
+
+    if args.path:
+        readings = replay_readings(args.path)
+        truth = oracle(readings)
+    elif args.synthetic:
+        readings, truth = synthetic_readings(args.synthetic, args.misread, args.unreadable, args.bite_every)
+    else:
+        parser.error("give a recording or --synthetic")
+
+    settings = [tuple(int(n) for n in vote.split('/')) for vote in (args.vote or ['2/3', '3/5'])]
+    runs = [('first read', declare_first_read(readings))]
+    runs += [(f"vote {n}/{m}", declare_voted(readings, n, m)) for n, m in settings]
+
+    hours = len(readings) * args.interval / 3600
+    print(f"{len(readings)} reads ({hours:.2f} h of polling at {args.interval * 1000:.0f} ms)")
+    print(f"{'rule':<12} {'bites':>6} {'true':>6} {'false':>6} {'missed':>7} {'false/h':>8} "
+          f"{'mean ms':>8} {'max ms':>8}")
+    for label, bites in runs:
+        tp, fp, missed, latencies = score(bites, truth)
+        mean_ms = np.mean(latencies) * args.interval * 1000 if latencies else 0.0
+        max_ms = max(latencies) * args.interval * 1000 if latencies else 0.0
+        print(f"{label:<12} {len(bites):>6} {tp:>6} {fp:>6} {missed:>7} {fp / max(hours, 1e-9):>8.1f} "
+              f"{mean_ms:>8.0f} {max_ms:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
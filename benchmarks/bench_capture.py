@@ -0,0 +1,63 @@
+"""
+Micro-benchmark: captures per second of a per-call mss instance versus the
+long-lived per-thread MssBackend used by Vision.
+
+Run from the project root:
+    python -m benchmarks.bench_capture [--seconds 3] [--region cast_rod]
+"""
+import argparse
+import time
+
+import cv2
+import mss
+import numpy as np
+
+from src.config import cfg
+from src.capture import MssBackend
+
+
+def _to_monitor(rect):
+    return {'left': rect[0], 'top': rect[1], 'width': rect[2], 'height': rect[3]}
+
+
+def grab_per_call(monitor):
+    # Mirrors the old Vision.screenshot(): new mss instance for every capture
+    with mss.mss() as sct:
+        img = np.array(sct.grab(monitor))
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+
+
+def run(label, func, seconds):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        func()
+        count += 1
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed
+    print(f"{label:<24} {count:>7} captures  {rate:>10.1f} /s  {1000.0 / rate:>8.3f} ms/capture")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=3.0, help="duration of each run")
+    parser.add_argument('--region', default='cast_rod', help="name of a region in cfg.REGIONS")
+    args = parser.parse_args()
+
+    rect = cfg.get_rect(args.region)
+    monitor = _to_monitor(rect)
+    backend = MssBackend()
+
+    def grab_session():
+        return cv2.cvtColor(backend.grab(rect), cv2.COLOR_BGRA2BGR)
+
+    print(f"Region '{args.region}': {monitor['width']}x{monitor['height']} at ({monitor['left']}, {monitor['top']})")
+    before = run("mss per capture", lambda: grab_per_call(monitor), args.seconds)
+    after = run("MssBackend (per thread)", grab_session, args.seconds)
+    backend.reset()
+    print(f"Speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
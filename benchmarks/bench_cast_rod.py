@@ -0,0 +1,99 @@
+"""
+Per-iteration cost of the _cast_rod polling step (F1/F2 x cast_rod/cast_rod_ice).
+
+  before: the original polling path; four searches, each grabbing its region
+          with a fresh mss instance (a fresh copy with --replay), converting
+          it and running a plain cv2.matchTemplate, without any cache
+  after:  one frame bus tick and one batched find_templates call
+
+Run from the project root against the live screen, or against a recording:
+    python -m benchmarks.bench_cast_rod [--iterations 500] [--replay <png-directory|video-file>]
+"""
+import argparse
+import time
+
+import cv2
+import mss
+import numpy as np
+
+from src.capture import open_replay_backend
+from src.config import cfg
+from src.frame_bus import frame_bus
+from src.vision import vision
+
+KEYS = ['F1_grayscale', 'F2_grayscale']
+
+
+def grab_fresh(region, replay):
+    """A new BGRA capture of `region`, as Vision.screenshot made before the capture backends."""
+    if replay is not None:
+        return np.array(replay.grab(region))
+    with mss.mss() as sct:
+        monitor = {'left': region[0], 'top': region[1], 'width': region[2], 'height': region[3]}
+        return np.array(sct.grab(monitor))
+
+
+def find_before(key, region, replay):
+    screenshot = cv2.cvtColor(grab_fresh(region, replay), cv2.COLOR_BGRA2BGR)
+    gray = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
+    result = cv2.matchTemplate(gray, vision.templates[key].image, cv2.TM_CCOEFF_NORMED)
+    return cv2.minMaxLoc(result)[1] >= 0.8
+
+
+def poll_before(cast_rod_region, cast_rod_ice_region, replay):
+    for key in KEYS:
+        if find_before(key, cast_rod_region, replay):
+            return key
+        if find_before(key, cast_rod_ice_region, replay):
+            return key
+    return None
+
+
+def poll_after(queries):
+    frame = frame_bus.tick(["cast_rod", "cast_rod_ice"])
+    found = next((m for m in vision.find_templates(queries, frame=frame) if m.hit), None)
+    return found.template if found else None
+
+
+def measure(label, func, iterations):
+    func()  # warm up buffers
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    mean = sum(samples) / len(samples)
+    p50 = samples[len(samples) // 2]
+    p95 = samples[int(len(samples) * 0.95)]
+    print(f"{label:<8} mean {mean * 1000:8.3f} ms   p50 {p50 * 1000:8.3f} ms   p95 {p95 * 1000:8.3f} ms")
+    return mean
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--replay', help="directory of PNG screenshots or a video file instead of the live screen")
+    args = parser.parse_args()
+
+    replay = None
+    if args.replay:
+        # Slow pacing so PNG/video decoding doesn't dominate the timings
+        replay = open_replay_backend(args.replay, fps=1.0, loop=True)
+        cfg.set_screen_size(*replay.screen_size())
+        vision.set_backend(replay)
+    vision.preload()
+    # Every poll is a new tick in the worker (they are 200 ms apart)
+    frame_bus.max_age = 0
+
+    cast_rod_region = cfg.get_rect("cast_rod")
+    cast_rod_ice_region = cfg.get_rect("cast_rod_ice")
+    queries = [(key, region, 0.8) for key in KEYS for region in (cast_rod_region, cast_rod_ice_region)]
+
+    before = measure("before", lambda: poll_before(cast_rod_region, cast_rod_ice_region, replay), args.iterations)
+    after = measure("after", lambda: poll_after(queries), args.iterations)
+    print(f"Speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
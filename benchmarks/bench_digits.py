@@ -0,0 +1,136 @@
+"""
+Accuracy and latency of the bait-count reader: the previous per-template
+cv2.matchTemplate loop versus the vectorized DigitRecognizer.
+
+The corpus is a directory of bait_count crops (BGR PNGs, captured at the
+current resolution) named "<count>_<anything>.png", or "none_<anything>.png"
+for crops without a readable counter.
+
+Run from the project root:
+    python -m benchmarks.bench_digits <crop-directory> [--repeat 20] [--threshold 0.7]
+"""
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from src.config import cfg
+from src.vision import vision
+
+
+def legacy_single_digit(gray_img, threshold):
+    # The pre-DigitRecognizer Vision._detect_single_digit
+    best_match, max_score = -1, -1
+    for i, template in enumerate(vision.digit_templates):
+        if template is None or template.height > gray_img.shape[0] or template.width > gray_img.shape[1]:
+            continue
+        res = cv2.matchTemplate(gray_img, template.image, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, _ = cv2.minMaxLoc(res)
+        if max_val > max_score:
+            max_score, best_match = max_val, i
+    return best_match if max_score >= threshold else None
+
+
+def legacy_digits(gray_img, threshold):
+    # The pre-DigitRecognizer Vision._detect_digits
+    found_digits = []
+    for i, template in enumerate(vision.digit_templates):
+        if template is None:
+            continue
+        res = cv2.matchTemplate(gray_img, template.image, cv2.TM_CCOEFF_NORMED)
+        loc = np.where(res >= threshold)
+        for pt in zip(*loc[::-1]):
+            found_digits.append({'digit': i, 'x': pt[0]})
+    if not found_digits:
+        return None
+    found_digits.sort(key=lambda d: d['x'])
+    unique_digits = [found_digits[0]]
+    for d in found_digits[1:]:
+        if d['x'] > unique_digits[-1]['x'] + 5:
+            unique_digits.append(d)
+    return int("".join(str(d['digit']) for d in unique_digits))
+
+
+def legacy_read(gray, threshold):
+    w = gray.shape[1]
+    crop_width = int(cfg.BAIT_CROP_WIDTH1_BASE * cfg.scale)
+    if w < crop_width:
+        return legacy_digits(gray, threshold)
+    ones = legacy_single_digit(gray[:, w - crop_width:w], threshold)
+    tens = legacy_single_digit(gray[:, 0:w - crop_width], threshold)
+    if ones is not None:
+        return tens * 10 + ones if tens is not None else ones
+    return legacy_digits(gray, threshold)
+
+
+def recognizer_read(gray, threshold):
+    # Same splitting as Vision.read_bait_count, on an in-memory crop
+    recognizer = vision.digit_recognizer
+    w = gray.shape[1]
+    crop_width = int(cfg.BAIT_CROP_WIDTH1_BASE * cfg.scale)
+    if w < crop_width:
+        return recognizer.segment(gray, threshold).value
+    ones = recognizer.classify(gray[:, w - crop_width:w], threshold).value
+    tens = recognizer.classify(gray[:, 0:w - crop_width], threshold).value
+    if ones is not None:
+        return tens * 10 + ones if tens is not None else ones
+    return recognizer.segment(gray, threshold).value
+
+
+def load_corpus(directory):
+    corpus = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith('.png'):
+            continue
+        label = filename.split('_', 1)[0]
+        expected = None if label == 'none' else int(label)
+        img = cv2.imdecode(np.fromfile(os.path.join(directory, filename), dtype=np.uint8), cv2.IMREAD_COLOR)
+        corpus.append((filename, cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), expected))
+    return corpus
+
+
+def evaluate(label, read, corpus, threshold, repeat):
+    correct = 0
+    misses = []
+    for filename, gray, expected in corpus:
+        value = read(gray, threshold)
+        if value == expected:
+            correct += 1
+        else:
+            misses.append(f"{filename}: expected {expected}, got {value}")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, gray, _ in corpus:
+            read(gray, threshold)
+    per_crop = (time.perf_counter() - start) / (repeat * len(corpus))
+
+    print(f"{label:<16} accuracy {correct}/{len(corpus)} ({100.0 * correct / len(corpus):.1f}%)   "
+          f"{per_crop * 1e6:8.1f} us/crop")
+    for miss in misses[:10]:
+        print(f"    {miss}")
+    return per_crop
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', help="directory of labelled bait_count crops")
+    parser.add_argument('--repeat', type=int, default=20, help="passes over the corpus for timing")
+    parser.add_argument('--threshold', type=float, default=0.7)
+    args = parser.parse_args()
+
+    vision.preload()
+    corpus = load_corpus(args.directory)
+    if not corpus:
+        print("No crops found.")
+        return
+
+    before = evaluate("matchTemplate", legacy_read, corpus, args.threshold, args.repeat)
+    after = evaluate("DigitRecognizer", recognizer_read, corpus, args.threshold, args.repeat)
+    print(f"Speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
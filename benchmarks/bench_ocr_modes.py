@@ -0,0 +1,109 @@
+"""
+Per-catch OCR latency and accuracy of the full RapidOCR pipeline (detection,
+classification, recognition) versus the fast mode of src.ocr_engine, which
+recognizes projection-segmented lines and falls back to full detection when
+a line scores low.
+
+The corpus is a directory of saved ocr_area crops (PNGs, captured at the
+current resolution, e.g. from debug_screenshots). An optional labels.csv
+with the columns file,text gives the expected text; without it the full
+pipeline's text is the reference. Text is compared with whitespace removed,
+and parse_catch_text() results (name, quality, weight) are compared too.
+
+Run from the project root:
+    python -m benchmarks.bench_ocr_modes <crop-directory> [--repeat 3] [--min-confidence 0.8]
+"""
+import argparse
+import csv
+import os
+import time
+
+import cv2
+import numpy as np
+
+from src.catch_parser import parse_catch_text
+from src.config import cfg
+from src.ocr_engine import ocr_engine, recognize_lines, segment_lines
+
+
+def load_corpus(directory):
+    labels = {}
+    labels_path = os.path.join(directory, 'labels.csv')
+    if os.path.exists(labels_path):
+        with open(labels_path, newline='', encoding='utf-8') as f:
+            labels = {row['file']: row['text'] for row in csv.DictReader(f)}
+    corpus = []
+    for file in sorted(os.listdir(directory)):
+        if file.lower().endswith('.png'):
+            img = cv2.imdecode(np.fromfile(os.path.join(directory, file), dtype=np.uint8), cv2.IMREAD_COLOR)
+            if img is not None:
+                corpus.append((file, img, labels.get(file)))
+    return corpus
+
+
+def normalize(text):
+    return "".join((text or "").split())
+
+
+def parsed(text):
+    catch = parse_catch_text(text, log=lambda message: None)
+    return None if catch is None else (catch['name'], catch['quality'], catch['weight'])
+
+
+def fast_only(engine, image, min_confidence):
+    """The fast path without its fallback; None when it would fall back."""
+    boxes = segment_lines(image)
+    return recognize_lines(engine, image, boxes, min_confidence) if boxes else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory')
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per crop (best is kept)")
+    parser.add_argument('--min-confidence', type=float,
+                        default=cfg.global_settings.get("ocr_fast_min_confidence", 0.8))
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.directory)
+    if not corpus:
+        parser.error("no PNG crops found")
+    engine = ocr_engine.get()
+    cfg.global_settings["ocr_fast_min_confidence"] = args.min_confidence
+
+    modes = {
+        'full': lambda image: engine(image)[0],
+        'fast only': lambda image: fast_only(engine, image, args.min_confidence),
+        'fast': lambda image: ocr_engine.read(image, "fast")[0],
+    }
+    texts = {mode: [] for mode in modes}
+    latencies = {mode: [] for mode in modes}
+    fallbacks = 0
+    for _, image, _ in corpus:
+        for mode, run in modes.items():
+            best = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                result = run(image)
+                best = min(best, time.perf_counter() - start)
+            latencies[mode].append(best)
+            texts[mode].append(None if result is None else "".join(res[1] for res in result))
+        fallbacks += ocr_engine.read(image, "fast")[1] == "full"
+
+    references = [label if label is not None else full for (_, _, label), full in zip(corpus, texts['full'])]
+    source = "labels.csv" if all(label is not None for _, _, label in corpus) else "full pipeline / labels.csv"
+    print(f"{len(corpus)} crops, reference text from {source}, fast min confidence {args.min_confidence}")
+    print(f"{'mode':<10} {'answered':>9} {'text ok':>8} {'parse ok':>9} {'mean ms':>8} {'p50 ms':>7} {'p90 ms':>7}")
+    for mode in modes:
+        answered = sum(text is not None for text in texts[mode])
+        text_ok = sum(text is not None and normalize(text) == normalize(ref)
+                      for text, ref in zip(texts[mode], references))
+        parse_ok = sum(text is not None and parsed(text) == parsed(ref)
+                       for text, ref in zip(texts[mode], references))
+        ms = np.array(latencies[mode]) * 1000
+        print(f"{mode:<10} {answered:>9} {text_ok:>8} {parse_ok:>9} {ms.mean():>8.1f} "
+              f"{np.percentile(ms, 50):>7.1f} {np.percentile(ms, 90):>7.1f}")
+    print(f"fast mode fell back to full detection on {fallbacks}/{len(corpus)} crops")
+
+
+if __name__ == "__main__":
+    main()
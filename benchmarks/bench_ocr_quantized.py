@@ -0,0 +1,75 @@
+"""
+Accuracy and latency of an int8-quantized recognition model (written by
+tools.quantize_ocr_model) against RapidOCR's bundled fp32 model, on saved
+ocr_area crops.
+
+Both engines get the same session options (config.json ocr_session). The
+corpus is read as in benchmarks.bench_ocr_modes: labels.csv gives the
+expected text when present, otherwise the fp32 engine's text is the
+reference. "same as fp32" counts crops whose text matches the fp32 model's
+exactly, labels or not.
+
+Run from the project root:
+    python -m benchmarks.bench_ocr_quantized <crop-directory> [--model models/rec.int8.onnx]
+        [--ocr-mode fast full] [--repeat 3]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmarks.bench_ocr_modes import load_corpus, normalize, parsed
+from src.config import cfg
+from src.ocr_engine import build_engine, read_text, rec_model_path
+from tools.quantize_ocr_model import DEFAULT_OUTPUT
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory')
+    parser.add_argument('--model', default=cfg.global_settings.get("ocr_rec_model") or str(DEFAULT_OUTPUT),
+                        help="quantized recognition model (default: ocr_rec_model or the tool's output)")
+    parser.add_argument('--ocr-mode', choices=('fast', 'full'), nargs='+', default=['fast', 'full'])
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per crop (best is kept)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.directory)
+    if not corpus:
+        parser.error("no PNG crops found")
+    model = rec_model_path(args.model)
+    if model is None:
+        parser.error(f"{args.model} not found; write it with: python -m tools.quantize_ocr_model")
+
+    engines = {'fp32': build_engine(rec_model=""), 'int8': build_engine(rec_model=model)}
+    print(f"{len(corpus)} crops, int8 model {os.path.basename(model)} "
+          f"({os.path.getsize(model) / 1e6:.1f} MB)")
+    print(f"{'model':<6} {'mode':<5} {'text ok':>8} {'parse ok':>9} {'same as fp32':>13} {'fallbacks':>10} "
+          f"{'mean ms':>8} {'p90 ms':>7}")
+    for mode in args.ocr_mode:
+        texts = {}
+        for name, engine in engines.items():
+            read_text(engine, corpus[0][1], mode)
+            texts[name], latencies, fallbacks = [], [], 0
+            for _, image, _ in corpus:
+                best = float('inf')
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    result, used = read_text(engine, image, mode)
+                    best = min(best, time.perf_counter() - start)
+                latencies.append(best)
+                fallbacks += used != mode
+                texts[name].append("".join(res[1] for res in result or []))
+
+            references = [label if label is not None else fp32
+                          for (_, _, label), fp32 in zip(corpus, texts['fp32'])]
+            text_ok = sum(normalize(text) == normalize(ref) for text, ref in zip(texts[name], references))
+            parse_ok = sum(parsed(text) == parsed(ref) for text, ref in zip(texts[name], references))
+            same = sum(normalize(text) == normalize(fp32) for text, fp32 in zip(texts[name], texts['fp32']))
+            ms = np.array(latencies) * 1000
+            print(f"{name:<6} {mode:<5} {text_ok:>8} {parse_ok:>9} {same:>13} {fallbacks:>10} "
+                  f"{ms.mean():>8.1f} {np.percentile(ms, 90):>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Sweeps ONNX Runtime session options of the OCR engine (the config.json
+global_settings["ocr_session"] keys) over saved ocr_area crops and reports
+per-crop latency and the CPU time it costs, which is what competes with the
+game and the template matching threads during the catch window.
+
+Every combination of the given values gets a freshly built engine, warmed
+up once before timing. CPU time is process time (all threads) per crop.
+
+Run from the project root:
+    python -m benchmarks.bench_ocr_session <crop-directory> [--intra 0 1 2 4] [--inter 0]
+        [--execution-mode sequential parallel] [--graph-optimization all extended]
+        [--arena off on] [--ocr-mode fast|full] [--repeat 3]
+"""
+import argparse
+import itertools
+import os
+import time
+
+import cv2
+import numpy as np
+
+from src.ocr_engine import build_engine, read_text, DEFAULT_SESSION_OPTIONS
+
+
+def load_crops(directory):
+    crops = []
+    for file in sorted(os.listdir(directory)):
+        if file.lower().endswith('.png'):
+            img = cv2.imdecode(np.fromfile(os.path.join(directory, file), dtype=np.uint8), cv2.IMREAD_COLOR)
+            if img is not None:
+                crops.append(img)
+    return crops
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory')
+    parser.add_argument('--intra', type=int, nargs='+', default=[0, 1, 2, 4], help="intra-op threads (0 = one per core)")
+    parser.add_argument('--inter', type=int, nargs='+', default=[DEFAULT_SESSION_OPTIONS["inter_op_threads"]])
+    parser.add_argument('--execution-mode', nargs='+', default=[DEFAULT_SESSION_OPTIONS["execution_mode"]])
+    parser.add_argument('--graph-optimization', nargs='+', default=[DEFAULT_SESSION_OPTIONS["graph_optimization"]])
+    parser.add_argument('--arena', choices=('off', 'on'), nargs='+', default=['off'])
+    parser.add_argument('--ocr-mode', choices=('fast', 'full'), default='full')
+    parser.add_argument('--repeat', type=int, default=3, help="passes over the crops per setting")
+    args = parser.parse_args()
+
+    crops = load_crops(args.directory)
+    if not crops:
+        parser.error("no PNG crops found")
+
+    print(f"{len(crops)} crops, {args.ocr_mode} OCR, {os.cpu_count()} cores")
+    print(f"{'intra':>5} {'inter':>5} {'mode':<10} {'graph':<9} {'arena':<5} "
+          f"{'mean ms':>8} {'p90 ms':>7} {'cpu ms':>7} {'cpu/wall':>8}")
+    for intra, inter, mode, graph, arena in itertools.product(
+            args.intra, args.inter, args.execution_mode, args.graph_optimization, args.arena):
+        options = {
+            "intra_op_threads": intra,
+            "inter_op_threads": inter,
+            "execution_mode": mode,
+            "graph_optimization": graph,
+            "cpu_mem_arena": arena == 'on',
+        }
+        engine = build_engine(options)
+        read_text(engine, crops[0], args.ocr_mode)
+
+        latencies = []
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for _ in range(args.repeat):
+            for crop in crops:
+                start = time.perf_counter()
+                read_text(engine, crop, args.ocr_mode)
+                latencies.append(time.perf_counter() - start)
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+
+        ms = np.array(latencies) * 1000
+        print(f"{intra:>5} {inter:>5} {mode:<10} {graph:<9} {arena:<5} {ms.mean():>8.1f} "
+              f"{np.percentile(ms, 90):>7.1f} {cpu * 1000 / len(latencies):>7.1f} {cpu / wall:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Startup cost of the OCR engine: constructing RapidOCR on the calling thread
+(what FishingWorker.__init__ used to do on the GUI thread) versus the
+background warm-up of src.ocr_engine.
+
+Each strategy runs in a fresh interpreter so both start cold. Reported:
+  - blocking: time the caller (the GUI thread) is blocked at startup
+  - first catch: latency of the first _record_catch OCR, which arrives
+    --catch-after seconds after startup (waiting for the engine included)
+
+Run from the project root:
+    python -m benchmarks.bench_ocr_startup [--catch-after 5] [--image catch.png]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import cv2
+
+
+def run_strategy(strategy, catch_after, image_path):
+    from src.ocr_engine import _warmup_image, ocr_engine
+
+    image = cv2.imread(image_path) if image_path else _warmup_image()
+    start = time.perf_counter()
+    if strategy == 'sync':
+        from rapidocr_onnxruntime import RapidOCR
+        engine = RapidOCR()
+        blocking = time.perf_counter() - start
+        time.sleep(max(catch_after - blocking, 0))
+        catch_start = time.perf_counter()
+    else:
+        ocr_engine.start()
+        blocking = time.perf_counter() - start
+        time.sleep(catch_after)
+        catch_start = time.perf_counter()
+        engine = ocr_engine.get()
+    engine(image)
+    return {'blocking': blocking, 'first_catch': time.perf_counter() - catch_start}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--catch-after', type=float, default=5.0, help="seconds from startup to the first catch")
+    parser.add_argument('--image', help="ocr_area crop of a catch popup; default renders some text")
+    parser.add_argument('--strategy', choices=('sync', 'background'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.strategy:
+        print(json.dumps(run_strategy(args.strategy, args.catch_after, args.image)))
+        return
+
+    print(f"First catch {args.catch_after:.1f} s after startup")
+    print(f"{'strategy':<12} {'blocking s':>11} {'first catch s':>14}")
+    for strategy in ('sync', 'background'):
+        command = [sys.executable, '-m', 'benchmarks.bench_ocr_startup', '--strategy', strategy,
+                   '--catch-after', str(args.catch_after)]
+        if args.image:
+            command += ['--image', args.image]
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{strategy:<12} {result['blocking']:>11.3f} {result['first_catch']:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
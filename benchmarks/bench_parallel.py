@@ -0,0 +1,98 @@
+"""
+Core scaling of Vision.find_templates() with the optional match pool.
+
+The workloads run on synthetic frames at the current resolution, with the
+crop cache and change gate disabled so every call really matches:
+
+  precheck  the worker's startup plan: F1 and F2 over the full screen, split
+            per template on the pool
+  reel-in   the five queries of the reeling_in plan (tiny prompt/star regions)
+  large     eight 480x270 regions (e.g. widened search areas)
+
+Each workload is timed serially and with 2, 4, ... threads up to the CPU
+count. The tiny reel-in regions are also timed with the pool forced on, which
+shows why find_templates() keeps small batches serial (PARALLEL_MIN_PIXELS).
+
+Run from the project root:
+    python -m benchmarks.bench_parallel [--iterations 200]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+import src.vision as vision_module
+from src.capture import Frame
+from src.config import cfg
+from src.detectors import planner
+from src.vision import vision
+
+
+def large_queries():
+    width, height = 480, 270
+    return [
+        ('F1_grayscale', (col * width, row * height, width, height), 0.8)
+        for row in range(2) for col in range(4)
+    ]
+
+
+def build_frames(rng, count):
+    shape = (cfg.screen_height, cfg.screen_width, 4)
+    return [
+        Frame(rng.integers(0, 256, shape, dtype=np.uint8), (0, 0, cfg.screen_width, cfg.screen_height), time.time())
+        for _ in range(count)
+    ]
+
+
+def time_queries(queries, frames, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        vision.find_templates(queries, frame=frames[i % len(frames)])
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--frames', type=int, default=4, help="distinct synthetic frames to cycle through")
+    parser.add_argument('--max-threads', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    vision._ensure_loaded()
+    # Measure matching, not the result caches
+    vision.crop_cache.max_size = 0
+    vision.change_gate.threshold = -1
+    frames = build_frames(np.random.default_rng(0), args.frames)
+
+    cpus = os.cpu_count() or 1
+    thread_counts = [1] + [n for n in (2, 4, 8, 16) if n <= args.max_threads]
+    precheck = planner.plan_for("precheck").queries
+    reel_in = planner.plan_for("reeling_in").queries
+    workloads = [
+        ('precheck', precheck, vision_module.PARALLEL_MIN_PIXELS),
+        ('reel-in', reel_in, vision_module.PARALLEL_MIN_PIXELS),
+        ('reel-in (forced)', reel_in, 0),
+        ('large', large_queries(), vision_module.PARALLEL_MIN_PIXELS),
+    ]
+
+    print(f"{cpus} CPUs, {args.iterations} iterations per cell, ms per find_templates call")
+    print(f"{'workload':<18}" + "".join(f"{f'{n} thr':>10}" for n in thread_counts))
+    original_min_pixels = vision_module.PARALLEL_MIN_PIXELS
+    try:
+        for name, queries, min_pixels in workloads:
+            vision_module.PARALLEL_MIN_PIXELS = min_pixels
+            row = []
+            for threads in thread_counts:
+                vision.set_match_threads(threads)
+                # Warm-up allocates the per-thread buffers
+                time_queries(queries, frames, len(frames) * 2)
+                row.append(time_queries(queries, frames, args.iterations))
+            print(f"{name:<18}" + "".join(f"{t * 1000:>10.3f}" for t in row))
+    finally:
+        vision_module.PARALLEL_MIN_PIXELS = original_min_pixels
+        vision.set_match_threads(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Accuracy and latency of icon presence checks: cv2.matchTemplate + minMaxLoc
+versus the dot-product PresenceMatcher Vision uses for tiny regions.
+
+The corpus is a directory of region crops (BGR PNGs, captured at the current
+resolution) laid out as <template_name>/hit/*.png and
+<template_name>/miss/*.png, e.g. F1_grayscale/hit/0001.png. Without a
+directory, --synthetic builds noisy crops from the templates themselves.
+
+Run from the project root:
+    python -m benchmarks.bench_presence <crop-directory> [--repeat 20]
+    python -m benchmarks.bench_presence --synthetic 200
+"""
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from src.correlation import PresenceMatcher
+from src.vision import vision
+
+# Thresholds the workers use
+THRESHOLDS = {'star_grayscale': 0.7}
+DEFAULT_THRESHOLD = 0.8
+# (rows, cols) by which the default regions exceed their template
+REGION_PADDING = {'star_grayscale': (0, 3), 'chang_grayscale': (2, 0)}
+
+
+def load_corpus(directory):
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        for label in ('hit', 'miss'):
+            label_dir = os.path.join(directory, name, label)
+            if not os.path.isdir(label_dir):
+                continue
+            for file in sorted(os.listdir(label_dir)):
+                img = cv2.imread(os.path.join(label_dir, file))
+                if img is not None:
+                    corpus.append((name, label == 'hit', cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)))
+    return corpus
+
+
+def synthetic_corpus(count, seed=0):
+    """Region-sized crops: the template plus capture noise, or unrelated texture."""
+    rng = np.random.default_rng(seed)
+    corpus = []
+    for name in ('F1_grayscale', 'F2_grayscale', 'star_grayscale', 'shangyu_grayscale', 'chang_grayscale'):
+        template = vision.templates[name].image
+        h, w = template.shape
+        pad_y, pad_x = REGION_PADDING.get(name, (0, 0))
+        for i in range(count):
+            crop = cv2.GaussianBlur(rng.integers(0, 256, (h + pad_y, w + pad_x), dtype=np.uint8), (0, 0), 1.5)
+            hit = i % 2 == 0
+            if hit:
+                y, x = rng.integers(0, pad_y + 1), rng.integers(0, pad_x + 1)
+                noisy = template.astype(np.int16) + rng.integers(-12, 13, template.shape)
+                crop[y:y + h, x:x + w] = np.clip(noisy, 0, 255)
+            corpus.append((name, hit, crop))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', nargs='?')
+    parser.add_argument('--synthetic', type=int, default=0, help="synthetic crops per template")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    vision._ensure_loaded()
+    if args.directory:
+        corpus = load_corpus(args.directory)
+    else:
+        corpus = synthetic_corpus(args.synthetic or 100)
+    if not corpus:
+        parser.error("no crops found")
+
+    matchers = {name: PresenceMatcher(vision.templates[name].image) for name in {name for name, _, _ in corpus}}
+
+    def legacy(name, crop):
+        result = cv2.matchTemplate(crop, vision.templates[name].image, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, _ = cv2.minMaxLoc(result)
+        return max_val
+
+    def presence(name, crop):
+        return matchers[name].best(crop)[0]
+
+    print(f"{len(corpus)} crops")
+    scores = {}
+    for label, fn in (('matchTemplate', legacy), ('PresenceMatcher', presence)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            scores[label] = [fn(name, crop) for name, _, crop in corpus]
+        elapsed = (time.perf_counter() - start) / (args.repeat * len(corpus))
+        correct = sum(
+            (score >= THRESHOLDS.get(name, DEFAULT_THRESHOLD)) == hit
+            for (name, hit, _), score in zip(corpus, scores[label])
+        )
+        print(f"{label:<16} accuracy {correct}/{len(corpus)} ({correct / len(corpus):.1%})  {elapsed * 1e6:>8.1f} us/crop")
+
+    diff = max(abs(a - b) for a, b in zip(scores['matchTemplate'], scores['PresenceMatcher']))
+    print(f"Max score difference: {diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
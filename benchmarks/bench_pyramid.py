@@ -0,0 +1,81 @@
+"""
+Latency of full-screen template matching (region=None): a single
+full-resolution cv2.matchTemplate versus the coarse-to-fine pyramid matcher.
+
+For each resolution the templates are rescaled as Vision would at that
+screen size. The prompt icons are pasted at random positions into textured
+synthetic frames, and both matchers have to report the same location and
+score.
+
+Run from the project root:
+    python -m benchmarks.bench_pyramid [--frames 10] [--repeat 5]
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from src.config import cfg
+from src.vision import vision
+
+RESOLUTIONS = [(1920, 1080), (2560, 1440), (3840, 2160)]
+TEMPLATES = ['F1_grayscale', 'F2_grayscale', 'star_grayscale']
+
+
+def build_frames(rng, width, height, count):
+    """Blurred-noise frames (gray), each with one template pasted somewhere."""
+    frames = []
+    for i in range(count):
+        noise = rng.integers(0, 256, (height, width), dtype=np.uint8)
+        image = cv2.GaussianBlur(noise, (0, 0), 3)
+        template = vision.templates[TEMPLATES[i % len(TEMPLATES)]]
+        x = int(rng.integers(0, width - template.width))
+        y = int(rng.integers(0, height - template.height))
+        image[y:y + template.height, x:x + template.width] = template.image
+        frames.append((template, image))
+    return frames
+
+
+def time_matcher(frames, use_pyramid, repeat):
+    vision.use_pyramid = use_pyramid
+    results = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [vision._compute_match(template, image, None, 0.8) for template, image in frames]
+    elapsed = (time.perf_counter() - start) / (repeat * len(frames))
+    return elapsed, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=10, help="synthetic frames per resolution")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    original_size = (cfg.screen_width, cfg.screen_height)
+    print(f"{'resolution':>10} {'full (ms)':>10} {'pyramid (ms)':>13} {'speedup':>8} {'agree':>7}")
+    try:
+        for width, height in RESOLUTIONS:
+            cfg.set_screen_size(width, height)
+            vision.load_templates()
+            frames = build_frames(rng, width, height, args.frames)
+
+            full_time, full_results = time_matcher(frames, False, args.repeat)
+            pyramid_time, pyramid_results = time_matcher(frames, True, args.repeat)
+            agree = sum(
+                a.center == b.center and abs(a.score - b.score) < 1e-4
+                for a, b in zip(full_results, pyramid_results)
+            )
+            print(f"{width}x{height:<5} {full_time * 1000:>10.1f} {pyramid_time * 1000:>13.1f} "
+                  f"{full_time / pyramid_time:>7.1f}x {agree:>3}/{len(frames)}")
+    finally:
+        vision.use_pyramid = True
+        cfg.set_screen_size(*original_size)
+        vision.load_templates()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Runs the FishingWorker state machine against a recorded session instead of
+the live desktop, for reproducible latency and throughput measurements.
+
+Run from the project root:
+    python -m benchmarks.replay_session <png-directory|video-file> [--fps 10] [--loop] [--duration 300]
+
+Without --fps every capture advances one recorded frame; with --fps the
+recording plays back against the wall clock.
+"""
+import argparse
+import os
+import sys
+import time
+
+from PySide6.QtCore import QCoreApplication, Qt
+
+from src.capture import open_replay_backend
+from src.config import cfg
+from src.frame_bus import frame_bus
+from src.vision import vision
+from src.workers import FishingWorker
+
+
+class RecordingInputs:
+    """
+    Stands in for InputController during replays: records the actions the
+    worker takes instead of sending them to the OS.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.is_mouse_down = False
+
+    def _record(self, action, *args):
+        self.events.append((time.time(), action, args))
+
+    def add_jitter(self, base_time):
+        return base_time
+
+    def hold_mouse(self, duration):
+        self._record('hold_mouse', duration)
+        time.sleep(duration)
+
+    def press_mouse_button(self):
+        self._record('press_mouse_button')
+        self.is_mouse_down = True
+
+    def release_mouse_button(self):
+        self._record('release_mouse_button')
+        self.is_mouse_down = False
+
+    def left_click(self):
+        self._record('left_click')
+
+    def click(self, x, y):
+        self._record('click', x, y)
+
+    def ensure_mouse_up(self):
+        if self.is_mouse_down:
+            self.release_mouse_button()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('path', help="directory of PNG screenshots or a video file")
+    parser.add_argument('--fps', type=float, default=None, help="playback rate; default advances one frame per capture")
+    parser.add_argument('--loop', action='store_true', help="restart the recording when it ends")
+    parser.add_argument('--duration', type=float, default=300.0, help="maximum run time in seconds")
+    parser.add_argument('--stop-timeout', type=float, default=30.0, help="seconds to wait for the worker to stop")
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    backend = open_replay_backend(args.path, fps=args.fps, loop=args.loop)
+    cfg.set_screen_size(*backend.screen_size())
+    vision.set_backend(backend)
+    print(f"Replaying {len(backend)} frames at {cfg.screen_width}x{cfg.screen_height}")
+
+    worker = FishingWorker(inputs=RecordingInputs())
+    records = []
+    start = time.time()
+
+    # No event loop runs here, so deliver signals directly from the worker thread
+    worker.log_updated.connect(lambda msg: print(f"[{time.time() - start:8.2f}s] {msg}"), Qt.DirectConnection)
+    worker.record_added.connect(records.append, Qt.DirectConnection)
+
+    worker.resume()
+    worker.start()
+    try:
+        while time.time() - start < args.duration and not backend.finished:
+            time.sleep(0.1)
+    finally:
+        worker.stop()
+        stopped = worker.wait(int(args.stop_timeout * 1000))
+        if stopped:
+            # Catches are recognized in the background; collect the ones still queued
+            worker.wait_for_catches(60)
+            backend.close()
+
+    if not stopped:
+        print(f"FAIL: the worker did not stop within {args.stop_timeout:.0f} s")
+        sys.stdout.flush()
+        # Destroying a running QThread aborts the interpreter; exit without tearing it down
+        os._exit(1)
+
+    elapsed = time.time() - start
+    bus = frame_bus.stats()
+    print("\n--- Replay summary ---")
+    print(f"Elapsed:        {elapsed:.2f} s")
+    print(f"Frame bus:      {bus['ticks']} ticks, {bus['grabs']} captures")
+    print(f"Input actions:  {len(worker.inputs.events)}")
+    print(f"Catches:        {len(records)}")
+    if records:
+        print(f"Time per catch: {elapsed / len(records):.2f} s")
+    ocr_cache = worker.ocr_cache.stats()
+    print(f"OCR cache:      {ocr_cache['hits']} hits, {ocr_cache['misses']} misses, "
+          f"{worker.duplicate_catches} duplicate catches suppressed")
+    for record in records:
+        print(f"  - {record}")
+    print("Detectors:")
+    telemetry = vision.telemetry.snapshot()
+    for name, stats in sorted(telemetry.items(), key=lambda item: -item[1]['total_ms']):
+        print(f"  {name:<16} {stats['calls']:>6} calls  hit {stats['hit_rate']:>6.1%}  "
+              f"p50 {stats['latency_ms']['p50']:>7.3f} ms  p99 {stats['latency_ms']['p99']:>7.3f} ms  "
+              f"{stats['total_ms']:>9.1f} ms total")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
+import time
+start_time = time.perf_counter()  # for the time-to-window log line
+
 import sys
 from pathlib import Path
 from PySide6.QtWidgets import QApplication
 from qfluentwidgets import setTheme, Theme
 from src.gui.main_window import MainWindow
 from src.config import cfg
+from src.ocr_engine import ocr_engine
 
 # --- Path Fix ---
 # Determine the base path in a way that is robust for both script and bundled app
@@ -21,6 +25,9 @@ cfg.set_base_path(application_path)
 
 if __name__ == "__main__":
     try:
+        # Load the OCR models in the background while the window is built
+        ocr_engine.start()
+
         app = QApplication(sys.argv)
         
         # Set theme based on config
@@ -31,6 +38,7 @@ if __name__ == "__main__":
             
         w = MainWindow()
         w.show()
+        print(f"Window shown {time.perf_counter() - start_time:.2f} s after startup")
         
         sys.exit(app.exec())
     except Exception as e:
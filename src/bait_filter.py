@@ -0,0 +1,47 @@
+from collections import deque
+
+# Readings at or above this confidence count as one full vote
+FULL_VOTE_CONFIDENCE = 0.9
+
+
+class BaitCountFilter:
+    """
+    N-of-M vote over the latest bait-count readings.
+
+    Every DigitReading votes for its value with a weight of
+    confidence / FULL_VOTE_CONFIDENCE (at most 1); unreadable frames don't
+    vote. A value is confirmed once it collects `votes` weight among the
+    last `window` readings, or once it fills the whole window, so a single
+    misread digit (an 8 read as a 6) never moves the confirmed value.
+    Consistent, confident readings confirm a change after `votes` reads, and
+    within `window` reads at the latest when some of them are marginal.
+    """
+
+    def __init__(self, votes=2, window=3):
+        if not 1 <= votes <= window:
+            raise ValueError(f"Need 1 <= votes <= window, got {votes} of {window}.")
+        self.votes = votes
+        self.window = window
+        self._readings = deque(maxlen=window)
+        self.value = None  # last confirmed count
+
+    def reset(self):
+        self._readings.clear()
+        self.value = None
+
+    def update(self, reading):
+        """Adds one DigitReading and returns the confirmed count (None until the first vote passes)."""
+        self._readings.append(reading)
+        weights, counts = {}, {}
+        for r in self._readings:
+            if r.value is not None:
+                weights[r.value] = weights.get(r.value, 0.0) + min(r.confidence / FULL_VOTE_CONFIDENCE, 1.0)
+                counts[r.value] = counts.get(r.value, 0) + 1
+        if weights:
+            value, weight = max(weights.items(), key=lambda item: item[1])
+            # Tolerate float rounding of full-weight votes; a unanimous window
+            # confirms whatever its confidence (otherwise votes == window would
+            # need every reading to be a full vote)
+            if weight >= self.votes - 1e-6 or counts[value] == self.window:
+                self.value = value
+        return self.value
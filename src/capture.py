@@ -0,0 +1,303 @@
+import ctypes
+import os
+import threading
+import time
+
+import cv2
+import mss
+import numpy as np
+
+from src.config import cfg
+
+
+def bounding_box(rects):
+    """Smallest (x, y, w, h) rectangle containing all `rects`."""
+    left = min(r[0] for r in rects)
+    top = min(r[1] for r in rects)
+    right = max(r[0] + r[2] for r in rects)
+    bottom = max(r[1] + r[3] for r in rects)
+    return (left, top, right - left, bottom - top)
+
+
+class Frame:
+    """
+    A timestamped BGRA capture of one screen rectangle.
+    Detectors take zero-copy views of their regions from it.
+    """
+
+    def __init__(self, image, rect, timestamp):
+        # Shared between threads, so protect it from in-place drawing.
+        # Backends already hand out read-only arrays; flipping the flag on
+        # every frame leaks a little inside numpy.
+        if image.flags.writeable:
+            image.flags.writeable = False
+        self.image = image
+        self.rect = rect  # (x, y, w, h) in screen coordinates
+        self.timestamp = timestamp
+
+    @property
+    def age(self):
+        return time.time() - self.timestamp
+
+    def contains(self, region):
+        """True if the screen rectangle `region` lies completely inside this frame."""
+        if region is None:
+            return self.rect == (0, 0, cfg.screen_width, cfg.screen_height)
+        x, y, w, h = region
+        fx, fy, fw, fh = self.rect
+        return x >= fx and y >= fy and x + w <= fx + fw and y + h <= fy + fh
+
+    def view(self, region):
+        """
+        Returns a numpy view (no copy) of `region` from this frame.
+        `None` returns the whole frame.
+        """
+        if region is None:
+            return self.image
+        x, y, w, h = region
+        fx, fy = self.rect[0], self.rect[1]
+        return self.image[y - fy:y - fy + h, x - fx:x - fx + w]
+
+
+class CaptureBackend:
+    """
+    Source of screen pixels for Vision.
+
+    grab(region) returns a BGRA uint8 array for the (x, y, w, h) screen
+    rectangle, or for the whole screen when region is None.
+    """
+
+    def grab(self, region=None):
+        raise NotImplementedError
+
+    def screen_size(self):
+        """(width, height) of the captured screen, or None if unknown."""
+        return None
+
+    def reset(self):
+        """Drops any cached state; the next grab starts fresh."""
+        pass
+
+    def close(self):
+        self.reset()
+
+
+class MssBackend(CaptureBackend):
+    """
+    Live desktop capture through mss, keeping one long-lived grabber per thread.
+
+    mss instances hold thread-bound GDI handles on Windows, so they can't be
+    shared between FishingWorker and PopupWorker. Creating one per screenshot
+    is safe but costs more than grabbing a 25x32 region. Instead each thread
+    lazily creates its own instance and keeps it (together with the bitmap
+    buffers mss reuses between grabs of the same size) until a grab fails or
+    the screen resolution changes.
+    """
+
+    # How often (seconds) to re-check the screen resolution
+    RESOLUTION_CHECK_INTERVAL = 1.0
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @staticmethod
+    def _query_screen_size():
+        try:
+            user32 = ctypes.windll.user32
+            return (user32.GetSystemMetrics(0), user32.GetSystemMetrics(1))
+        except Exception:
+            return None
+
+    def _get_sct(self):
+        local = self._local
+        sct = getattr(local, 'sct', None)
+        now = time.time()
+
+        if sct is not None and now - local.checked_at >= self.RESOLUTION_CHECK_INTERVAL:
+            local.checked_at = now
+            if self._query_screen_size() != local.screen_size:
+                print("Screen resolution changed, rebuilding capture session.")
+                self.reset()
+                sct = None
+
+        if sct is None:
+            sct = mss.mss()
+            local.sct = sct
+            local.screen_size = self._query_screen_size()
+            local.checked_at = now
+        return sct
+
+    def _grab_raw(self, region):
+        sct = self._get_sct()
+        if region is None:
+            # Use the primary monitor
+            monitor = sct.monitors[1]
+        else:
+            monitor = {'left': region[0], 'top': region[1], 'width': region[2], 'height': region[3]}
+        return sct.grab(monitor)
+
+    def grab(self, region=None):
+        """Grabs with this thread's grabber, retrying once with a fresh one on failure."""
+        try:
+            sct_img = self._grab_raw(region)
+        except Exception:
+            self.reset()
+            sct_img = self._grab_raw(region)
+        # Wrap the BGRA bytes mss already returned instead of copying them
+        raw = memoryview(sct_img.raw).toreadonly()
+        return np.frombuffer(raw, dtype=np.uint8).reshape(sct_img.height, sct_img.width, 4)
+
+    def screen_size(self):
+        sct = self._get_sct()
+        monitor = sct.monitors[1]
+        return (monitor['width'], monitor['height'])
+
+    def reset(self):
+        """Closes the calling thread's grabber; the next grab creates a new one."""
+        sct = getattr(self._local, 'sct', None)
+        self._local.sct = None
+        if sct is not None:
+            try:
+                sct.close()
+            except Exception:
+                pass
+
+
+class ReplayBackend(CaptureBackend):
+    """
+    Base for backends that replay recorded full-screen frames.
+
+    Pacing:
+      - fps=None: every grab advances one frame, so a run is fully reproducible
+        regardless of how fast the machine is.
+      - fps=N: the current frame follows the wall clock at N frames per second,
+        like a live screen would.
+    At the end of the recording the last frame is held (finished becomes True)
+    unless loop is set.
+    """
+
+    def __init__(self, fps=None, loop=False):
+        self.fps = fps
+        self.loop = loop
+        self.finished = False
+        self._lock = threading.Lock()
+        self._start_time = None
+        self._index = -1
+        self._frame = None
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def _read_frame(self, index):
+        """Returns frame `index` as a BGRA array."""
+        raise NotImplementedError
+
+    def _target_index(self):
+        if self.fps is None:
+            return self._index + 1
+        if self._start_time is None:
+            self._start_time = time.time()
+        return int((time.time() - self._start_time) * self.fps)
+
+    def _current_frame(self):
+        with self._lock:
+            target = self._target_index()
+            count = len(self)
+            if target >= count:
+                if self.loop and count:
+                    target %= count
+                else:
+                    target = count - 1
+                    self.finished = True
+            if target != self._index or self._frame is None:
+                self._frame = self._read_frame(target)
+                self._frame.flags.writeable = False
+                self._index = target
+            return self._frame
+
+    def grab(self, region=None):
+        frame = self._current_frame()
+        if region is None:
+            return frame
+        x, y, w, h = region
+        return frame[y:y + h, x:x + w]
+
+    def screen_size(self):
+        with self._lock:
+            frame = self._frame if self._frame is not None else self._read_frame(0)
+        return (frame.shape[1], frame.shape[0])
+
+    def reset(self):
+        with self._lock:
+            self._start_time = None
+            self._index = -1
+            self._frame = None
+            self.finished = False
+
+
+class ImageDirBackend(ReplayBackend):
+    """Replays a directory of full-screen PNG screenshots in filename order."""
+
+    def __init__(self, directory, fps=None, loop=False):
+        super().__init__(fps=fps, loop=loop)
+        self.directory = directory
+        self.files = sorted(
+            os.path.join(directory, f) for f in os.listdir(directory) if f.lower().endswith('.png')
+        )
+        if not self.files:
+            raise ValueError(f"No PNG frames found in '{directory}'.")
+
+    def __len__(self):
+        return len(self.files)
+
+    def _read_frame(self, index):
+        # imdecode supports Chinese characters in the path
+        img = cv2.imdecode(np.fromfile(self.files[index], dtype=np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError(f"Failed to decode frame '{self.files[index]}'.")
+        return cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+
+
+class VideoBackend(ReplayBackend):
+    """
+    Replays a screen recording. Pass fps=backend.video_fps to replay it at
+    the speed it was recorded.
+    """
+
+    def __init__(self, path, fps=None, loop=False):
+        super().__init__(fps=fps, loop=loop)
+        self.path = path
+        self._cap = cv2.VideoCapture(path)
+        if not self._cap.isOpened():
+            raise ValueError(f"Failed to open video '{path}'.")
+        self._frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.video_fps = self._cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self._position = 0  # index of the next frame the decoder returns
+
+    def __len__(self):
+        return self._frame_count
+
+    def _read_frame(self, index):
+        # Decoding is sequential; only seek when going backwards (looping)
+        if index < self._position:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+            self._position = index
+        while self._position < index:
+            self._cap.grab()
+            self._position += 1
+        ok, img = self._cap.read()
+        if not ok:
+            raise ValueError(f"Failed to read frame {index} from '{self.path}'.")
+        self._position += 1
+        return cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+
+    def close(self):
+        super().close()
+        self._cap.release()
+
+
+def open_replay_backend(path, fps=None, loop=False):
+    """Picks ImageDirBackend for directories and VideoBackend for files."""
+    if os.path.isdir(path):
+        return ImageDirBackend(path, fps=fps, loop=loop)
+    return VideoBackend(path, fps=fps, loop=loop)
@@ -0,0 +1,88 @@
+import re
+
+
+def parse_catch_text(full_text, log=print):
+    """
+    解析渔获弹窗的 OCR 文本, 返回 {'name', 'weight', 'quality', 'is_new_record'},
+    不是渔获信息时返回 None。解析过程通过 log 输出
+    """
+    # 检测是否为新纪录
+    is_new_record = "新纪录" in full_text or "新记录" in full_text
+    if is_new_record:
+        log("检测到新纪录！")
+        # 移除关键词以免干扰后续解析
+        full_text = full_text.replace("新纪录", "").replace("新记录", "")
+
+    # 增强容错：只要文本中包含关键字即可，不需要精确匹配
+    if "你钓到了" not in full_text:
+        # 尝试模糊匹配或查找后续特征，如"千克"
+        if "千克" in full_text:
+            log("未检测到'你钓到了'前缀，但发现重量单位，尝试继续解析。")
+            # 假设所有文本都是有效信息
+        else:
+            log("OCR结果不包含关键字，判定为钓鱼失败。")
+            return None
+
+    cleaned_text = full_text.replace(" ", "").replace("(", "").replace(")", "")
+
+    # 检测并清理新纪录关键词
+    # 已经在前一步做了初步检测，这里进行清理以防止干扰后续解析
+    new_record_keywords = ["新纪录", "新记录", "首次捕获", "首次"]
+    for kw in new_record_keywords:
+        if kw in cleaned_text:
+            is_new_record = True # 再次确认
+            cleaned_text = cleaned_text.replace(kw, "")
+
+    # 额外清理冒号，OCR识别“首次捕获”后常伴随冒号
+    cleaned_text = cleaned_text.replace(":", "").replace("：", "")
+
+    try:
+        # 移除固定的前缀 "你钓到了" (如果存在)
+        if "你钓到了" in cleaned_text:
+            text_after_prefix = cleaned_text.split("你钓到了", 1)[-1]
+        else:
+            text_after_prefix = cleaned_text
+
+        # 定义所有可能的品质
+        # 包含繁体字和同义词
+        qualities = ['标准', '非凡', '稀有', '史诗', '传说', '传奇', '標準', '傳說', '傳奇']
+
+        # 提取重量
+        weight = 0.0
+        weight_match = re.search(r"(\d+\.?\d*)千克", text_after_prefix)
+        if weight_match:
+            weight = float(weight_match.group(1))
+            # 从字符串中移除重量信息以便于解析鱼名和品质
+            text_after_prefix = text_after_prefix.replace(weight_match.group(0), "").strip()
+
+        # 提取品质
+        quality = "普通" # 默认值
+        for q in qualities:
+            if q in text_after_prefix:
+                quality = q
+                # 从字符串中移除品质信息
+                text_after_prefix = text_after_prefix.replace(q, "").strip()
+                break
+
+        # 品质名称归一化
+        if quality in ['传奇', '傳奇', '傳說']:
+            quality = '传说'
+        elif quality == '標準':
+            quality = '标准'
+
+        # 剩下的就是鱼名，移除任何特殊字符
+        fish_name = re.sub(r'[★☆]', '', text_after_prefix).strip()
+        # 后处理：移除鱼名末尾的数字
+        fish_name = re.sub(r'\d+$', '', fish_name)
+
+        if not fish_name:
+            log(f"无法从 '{full_text}' 中解析出鱼名。")
+            return None
+
+        log(f"解析结果 -> 鱼名: '{fish_name}', 品质: '{quality}', 重量: {weight}")
+
+    except Exception as e:
+        log(f"数据解析过程中发生错误: {e}")
+        return None
+
+    return {'name': fish_name, 'weight': weight, 'quality': quality, 'is_new_record': is_new_record}
@@ -17,7 +17,11 @@ class Config(metaclass=SingletonMeta):
         try:
             ctypes.windll.shcore.SetProcessDpiAwareness(1)
         except AttributeError:
-            ctypes.windll.user32.SetProcessDPIAware()
+            try:
+                ctypes.windll.user32.SetProcessDPIAware()
+            except AttributeError:
+                # Not on Windows, e.g. replaying recorded sessions on Linux
+                pass
             
         # Base resolution
         self.BASE_SCREEN_WIDTH = 2560
@@ -26,16 +30,14 @@ class Config(metaclass=SingletonMeta):
         # Get current screen resolution
         try:
             user32 = ctypes.windll.user32
-            self.screen_width = user32.GetSystemMetrics(0)
-            self.screen_height = user32.GetSystemMetrics(1)
+            screen_width = user32.GetSystemMetrics(0)
+            screen_height = user32.GetSystemMetrics(1)
         except Exception:
-            self.screen_width = self.BASE_SCREEN_WIDTH
-            self.screen_height = self.BASE_SCREEN_HEIGHT
-
-        # Calculate scaling factors
-        self.scale_x = self.screen_width / self.BASE_SCREEN_WIDTH
-        self.scale_y = self.screen_height / self.BASE_SCREEN_HEIGHT
-        self.scale = self.screen_height / self.BASE_SCREEN_HEIGHT
+            screen_width = self.BASE_SCREEN_WIDTH
+            screen_height = self.BASE_SCREEN_HEIGHT
+        # Calibrated layouts keyed by "WIDTHxHEIGHT" (see src.layout)
+        self.layout_profiles = {}
+        self.set_screen_size(screen_width, screen_height)
 
         # Configuration storage
         self.current_preset_name = "路亚轻杆"
@@ -54,6 +56,37 @@ class Config(metaclass=SingletonMeta):
             "jiashi_popup": {"coords": (1244, 676, 27, 28), "anchor": "center"},
             "ocr_area":     {"coords": (915, 75, 725, 150), "anchor": "top_center"},
         }
+
+        # Detector registry: what to look for, where, and how.
+        # "region" is a REGIONS key (None = whole primary monitor); "method" is
+        # "template" (template matching) or "digits" (bait counter reader).
+        # Thresholds can be overridden per detector under "detectors" in config.json.
+        self.DETECTORS = {
+            "screen_F1":       {"template": "F1_grayscale", "region": None, "threshold": 0.8, "method": "template"},
+            "screen_F2":       {"template": "F2_grayscale", "region": None, "threshold": 0.8, "method": "template"},
+            "cast_rod_F1":     {"template": "F1_grayscale", "region": "cast_rod", "threshold": 0.8, "method": "template"},
+            "cast_rod_ice_F1": {"template": "F1_grayscale", "region": "cast_rod_ice", "threshold": 0.8, "method": "template"},
+            "cast_rod_F2":     {"template": "F2_grayscale", "region": "cast_rod", "threshold": 0.8, "method": "template"},
+            "cast_rod_ice_F2": {"template": "F2_grayscale", "region": "cast_rod_ice", "threshold": 0.8, "method": "template"},
+            "wait_bite_F1":    {"template": "F1_grayscale", "region": "wait_bite", "threshold": 0.8, "method": "template"},
+            "wait_bite_F2":    {"template": "F2_grayscale", "region": "wait_bite", "threshold": 0.8, "method": "template"},
+            "reel_in_star":    {"template": "star_grayscale", "region": "reel_in_star", "threshold": 0.7, "method": "template"},
+            "shangyu":         {"template": "shangyu_grayscale", "region": "shangyu", "threshold": 0.8, "method": "template"},
+            "jiashi_popup":    {"template": "chang_grayscale", "region": "jiashi_popup", "threshold": 0.8, "method": "template"},
+            "bait_count":      {"template": None, "region": "bait_count", "threshold": 0.7, "method": "digits"},
+        }
+
+        # Detectors each worker state polls together (see src.detectors)
+        self.DETECTOR_PLANS = {
+            "precheck":         ["screen_F1", "screen_F2", "bait_count"],
+            "finding_prompt":   ["cast_rod_F1", "cast_rod_ice_F1", "cast_rod_F2", "cast_rod_ice_F2"],
+            "waiting_for_bite": ["bait_count"],
+            "reeling_in":       ["cast_rod_F1", "cast_rod_ice_F1", "cast_rod_F2", "cast_rod_ice_F2", "reel_in_star"],
+            "catch":            ["shangyu"],
+            "popup":            ["jiashi_popup"],
+        }
+        # Per-detector overrides loaded from config.json
+        self.detector_overrides = {}
         
         # Constants
         self.BAIT_CROP_WIDTH1_BASE = 15
@@ -65,6 +98,33 @@ class Config(metaclass=SingletonMeta):
         
         self._load_config_from_json()
 
+    def set_screen_size(self, width, height):
+        """
+        Sets the screen resolution and recalculates the scaling factors.
+        Used at startup and when replaying recordings made at another resolution.
+        """
+        self.screen_width = width
+        self.screen_height = height
+        self.scale_x = self.screen_width / self.BASE_SCREEN_WIDTH
+        self.scale_y = self.screen_height / self.BASE_SCREEN_HEIGHT
+        self.scale = self.screen_height / self.BASE_SCREEN_HEIGHT
+        self.layout_offset = (0, 0)
+        profile = self.layout_profiles.get(self.layout_key())
+        if profile is not None:
+            self.apply_layout(profile["scale"], profile["offset_x"], profile["offset_y"])
+
+    def layout_key(self):
+        return f"{self.screen_width}x{self.screen_height}"
+
+    def apply_layout(self, scale, offset_x=0, offset_y=0):
+        """
+        Overrides the scale derived from the screen size with a measured UI
+        scale and shifts every region by (offset_x, offset_y) pixels, e.g. for
+        windowed or letterboxed games. Templates must be reloaded afterwards.
+        """
+        self.scale = self.scale_x = self.scale_y = scale
+        self.layout_offset = (offset_x, offset_y)
+
     def set_base_path(self, path):
         """Sets the base path for the application. Should be called once at startup."""
         self._base_path = path
@@ -186,7 +246,7 @@ class Config(metaclass=SingletonMeta):
         new_x = int((self.screen_width / 2) + (offset_from_center_x * self.scale_x))
         new_y = int((self.screen_height / 2) + (offset_from_center_y * self.scale_y))
         
-        return (new_x, new_y)
+        return (new_x + self.layout_offset[0], new_y + self.layout_offset[1])
 
     def __getattr__(self, name):
         """
@@ -215,7 +275,9 @@ class Config(metaclass=SingletonMeta):
         # Avoid recursion for instance attributes defined in __init__
         if name in ['BASE_SCREEN_WIDTH', 'BASE_SCREEN_HEIGHT', 'screen_width', 'screen_height', 
                     'scale_x', 'scale_y', 'scale', 'current_preset_name', 'presets', 
-                    'global_settings', 'qfluent_settings', 'REGIONS', '_instances']:
+                    'global_settings', 'qfluent_settings', 'REGIONS', '_instances',
+                    'DETECTORS', 'DETECTOR_PLANS', 'detector_overrides',
+                    'layout_profiles', 'layout_offset']:
             super().__setattr__(name, value)
             return
 
@@ -242,13 +304,42 @@ class Config(metaclass=SingletonMeta):
             "冰钓重杆": {"cast_time": 2.5, "reel_in_time": 2.2, "release_time": 1.2, "max_pulls": 18, "cycle_interval": 0.5}
         }
 
+    def _get_default_global_settings(self):
+        """Returns a dictionary of default global settings."""
+        return {
+            "hotkey": "F2",
+            "debug_hotkey": "F10",
+            "enable_jiashi": True,
+            "jitter_range": 0,
+            "theme": "Light",
+            # Threads for parallel template matching (0 = match serially)
+            "match_threads": 0,
+            # A bait count must win `bait_votes` of the last `bait_vote_window` reads (see src.bait_filter)
+            "bait_votes": 2,
+            "bait_vote_window": 3,
+            # Calibrate the UI layout automatically when the startup precheck fails at an
+            # uncalibrated resolution; the profile is only saved if the precheck then passes
+            "auto_calibrate_layout": False,
+            # "fast": recognize projection-segmented lines, full detection only as fallback; "full": always detect
+            "ocr_mode": "fast",
+            "ocr_fast_min_confidence": 0.8,
+            # ONNX Runtime overrides of RapidOCR's session settings (src.ocr_engine.DEFAULT_SESSION_OPTIONS),
+            # e.g. {"intra_op_threads": 2}; empty keeps the engine exactly as RapidOCR builds it
+            "ocr_session": {},
+            # Recognition model replacing RapidOCR's bundled one, e.g. the int8 copy
+            # written by tools.quantize_ocr_model; "" = bundled
+            "ocr_rec_model": "",
+            # Seconds a catch card is remembered: re-reading it is a duplicate, not a new catch
+            "ocr_cache_ttl": 15.0,
+        }
+
     def _load_config_from_json(self):
         base_path = self._get_base_path()
         config_path = base_path / "config" / "config.json"
         if not config_path.exists():
             # If config file doesn't exist, create it with default values
             self.presets = self._get_default_presets()
-            self.global_settings = {"hotkey": "F2", "debug_hotkey": "F10", "enable_jiashi": True, "jitter_range": 0, "theme": "Light"}
+            self.global_settings = self._get_default_global_settings()
             self.qfluent_settings = {"ThemeMode": "Light"}
             self.save()
             return
@@ -259,7 +350,7 @@ class Config(metaclass=SingletonMeta):
             except json.JSONDecodeError:
                 # Handle corrupted JSON file
                 self.presets = self._get_default_presets()
-                self.global_settings = {"hotkey": "F2", "debug_hotkey": "F10", "enable_jiashi": True, "jitter_range": 0, "theme": "Light"}
+                self.global_settings = self._get_default_global_settings()
                 self.qfluent_settings = {"ThemeMode": "Light"}
                 self.save()
                 return
@@ -268,12 +359,16 @@ class Config(metaclass=SingletonMeta):
         self.presets = config_data.get("presets", self._get_default_presets())
         
         # Load global settings with defaults for missing keys
-        default_global_settings = {"hotkey": "F2", "debug_hotkey": "F10", "enable_jiashi": True, "jitter_range": 0, "theme": "Light"}
+        default_global_settings = self._get_default_global_settings()
         loaded_global_settings = config_data.get("global_settings", {})
         default_global_settings.update(loaded_global_settings)
         self.global_settings = default_global_settings
         
         self.qfluent_settings = config_data.get("QFluentWidgets", {"ThemeMode": "Light"})
+        self.detector_overrides = config_data.get("detectors", {})
+        self.layout_profiles = config_data.get("layouts", {})
+        # Re-apply the resolution now that its calibrated profile is known
+        self.set_screen_size(self.screen_width, self.screen_height)
     
     def save(self):
         """
@@ -294,6 +389,10 @@ class Config(metaclass=SingletonMeta):
             "global_settings": self.global_settings,
             "QFluentWidgets": self.qfluent_settings
         }
+        if self.detector_overrides:
+            config_data["detectors"] = self.detector_overrides
+        if self.layout_profiles:
+            config_data["layouts"] = self.layout_profiles
         
         # Ensure directory exists
         config_path.parent.mkdir(parents=True, exist_ok=True)
@@ -312,6 +411,14 @@ class Config(metaclass=SingletonMeta):
         else:
             raise ValueError(f"Preset '{name}' not found.")
 
+    def get_detector(self, name):
+        """Returns the registry entry for a detector with config.json overrides applied."""
+        if name not in self.DETECTORS:
+            raise KeyError(f"Detector '{name}' not defined in Config.")
+        detector = dict(self.DETECTORS[name])
+        detector.update(self.detector_overrides.get(name, {}))
+        return detector
+
     def get_rect(self, name):
         """
         Calculates the scaled rectangle for a predefined region using an anchor-based dispatcher.
@@ -334,14 +441,15 @@ class Config(metaclass=SingletonMeta):
         calculation_method = dispatcher.get(anchor_type)
 
         if calculation_method:
-            return calculation_method(coords)
+            x, y, w, h = calculation_method(coords)
         else: # "default" or any other undefined anchor
             x, y, w, h = coords
-            scaled_x = int(x * self.scale_x)
-            scaled_y = int(y * self.scale_y)
-            scaled_w = int(w * self.scale_x)
-            scaled_h = int(h * self.scale_y)
-            return (scaled_x, scaled_y, scaled_w, scaled_h)
+            x = int(x * self.scale_x)
+            y = int(y * self.scale_y)
+            w = int(w * self.scale_x)
+            h = int(h * self.scale_y)
+        # Shift by the calibrated layout offset (0, 0 unless calibrated)
+        return (x + self.layout_offset[0], y + self.layout_offset[1], w, h)
 
 # Instantiate the singleton
 cfg = Config()
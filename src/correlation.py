@@ -0,0 +1,110 @@
+import threading
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+
+class TemplateCorrelator:
+    """
+    TM_CCOEFF_NORMED for small grayscale crops, computed with numpy dot products.
+
+    Same-sized templates are stacked into one matrix of zero-mean, unit-norm
+    rows. Every template-sized window of a crop is normalised the same way,
+    so one matrix product scores every template at every offset without
+    cv2.matchTemplate's per-call result allocation and minMaxLoc pass.
+    """
+
+    def __init__(self, templates):
+        """`templates` is a non-empty list of same-sized grayscale images."""
+        self.shape = templates[0].shape[:2]
+        self.matrix = self._normalize(np.stack([img.reshape(-1) for img in templates]))
+        self._matrix_t = self.matrix.T
+        size = self.matrix.shape[1]
+        self._ones = np.ones(size, np.float32)
+        self._mean_weights = np.full(size, 1.0 / size, np.float32)
+        # Per-thread scratch buffers, keyed by crop shape
+        self._local = threading.local()
+
+    @staticmethod
+    def _normalize(rows):
+        """Zero-mean, unit-norm float32 rows (flat rows stay all zeros and score 0)."""
+        rows = rows.astype(np.float32)
+        rows -= rows.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        np.divide(rows, norms, out=rows, where=norms > 0)
+        return rows
+
+    def offsets(self, shape):
+        """Number of template positions inside a crop of `shape`."""
+        h, w = self.shape
+        return max(0, shape[0] - h + 1) * max(0, shape[1] - w + 1)
+
+    def _scratch(self, shape):
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        scratch = buffers.get(shape)
+        if scratch is None:
+            h, w = self.shape
+            n = self.offsets(shape)
+            scratch = (
+                np.empty((n, h * w), np.float32),               # window vectors
+                np.empty((n, h * w), np.float32),               # squared deviations
+                np.empty(n, np.float32),                        # means, then norms
+                np.empty((n, self.matrix.shape[0]), np.float32),  # scores
+            )
+            buffers[shape] = scratch
+        return scratch
+
+    def score_windows(self, gray):
+        """
+        Scores of every template at every offset of `gray`, shape
+        (rows, cols, templates). Returns None if the crop is smaller than the
+        templates.
+
+        Runs on preallocated per-thread buffers so polling doesn't allocate.
+        """
+        h, w = self.shape
+        if gray.shape[0] < h or gray.shape[1] < w:
+            return None
+        n_rows, n_cols = gray.shape[0] - h + 1, gray.shape[1] - w + 1
+        vectors, squares, stats, scores = self._scratch(gray.shape[:2])
+
+        if n_rows == n_cols == 1:
+            # Crop exactly the size of the template (the usual case)
+            np.copyto(vectors.reshape(h, w), gray, casting='unsafe')
+        else:
+            # Every window as one strided view, gathered with a single copy
+            windows = as_strided(gray, (n_rows, n_cols, h, w), gray.strides[:2] * 2, writeable=False)
+            np.copyto(vectors.reshape(n_rows, n_cols, h, w), windows, casting='unsafe')
+
+        # Center each window, then divide the correlation by the window norm;
+        # flat windows are all zeros after centering and score 0
+        np.dot(vectors, self._mean_weights, out=stats)
+        vectors -= stats[:, None]
+        np.multiply(vectors, vectors, out=squares)
+        np.dot(squares, self._ones, out=stats)
+        np.sqrt(stats, out=stats)
+        np.maximum(stats, 1e-6, out=stats)
+        np.dot(vectors, self._matrix_t, out=scores)
+        scores /= stats[:, None]
+        return scores.reshape(n_rows, n_cols, self.matrix.shape[0])
+
+
+class PresenceMatcher(TemplateCorrelator):
+    """
+    Single-template correlator for presence checks on tiny regions, where the
+    region is the template size or only a few pixels larger.
+    """
+
+    def __init__(self, template):
+        super().__init__([template])
+
+    def best(self, gray):
+        """Returns (score, (x, y)) of the best offset, like cv2.minMaxLoc's max."""
+        scores = self.score_windows(gray)
+        if scores is None:
+            return -1.0, (0, 0)
+        n_cols = scores.shape[1]
+        index = int(scores.argmax())
+        return float(scores.flat[index]), (index % n_cols, index // n_cols)
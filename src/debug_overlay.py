@@ -5,6 +5,7 @@ from datetime import datetime
 from pathlib import Path
 
 from src.vision import vision
+from src.frame_bus import frame_bus
 from src.config import cfg
 
 def generate_debug_screenshot(show_image=True):
@@ -12,7 +13,8 @@ def generate_debug_screenshot(show_image=True):
     Captures screen, draws debug overlays, and saves/shows the image.
     """
     print("Capturing screenshot...")
-    screenshot = vision.screenshot()
+    # Frames on the bus are shared read-only BGRA; converting gives a BGR copy to draw on
+    screenshot = cv2.cvtColor(frame_bus.tick_screen().image, cv2.COLOR_BGRA2BGR)
     
     # CRITICAL FIX: Build the config dict with SCALED coordinates from cfg.get_rect()
     debug_config = {}
@@ -0,0 +1,118 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from src.config import cfg
+from src.frame_bus import frame_bus
+from src.vision import vision
+
+
+@dataclass(frozen=True)
+class Detector:
+    """One entry of the detector registry (Config.DETECTORS)."""
+    name: str
+    template: str  # template name, None for the digit reader
+    region: str  # Config.REGIONS key, None for the whole primary monitor
+    threshold: float
+    method: str  # "template" or "digits"
+
+    @classmethod
+    def from_config(cls, name):
+        entry = cfg.get_detector(name)
+        return cls(name, entry.get("template"), entry.get("region"),
+                   entry["threshold"], entry.get("method", "template"))
+
+
+class ExecutionPlan:
+    """
+    A set of detectors compiled for one worker state.
+
+    Regions are resolved to screen rectangles once, the frame bus captures
+    their bounding box once per run, and all template detectors are answered
+    by one find_templates() call, which converts each region once and can
+    match the regions on the match pool. Each run returns {detector name:
+    MatchResult or DigitReading} in the order the detectors were declared.
+    """
+
+    def __init__(self, detectors):
+        self.detectors = detectors
+        self.rects = {d.name: cfg.get_rect(d.region) if d.region is not None else None for d in detectors}
+        self.full_screen = any(d.region is None for d in detectors)
+        self.region_names = sorted({d.region for d in detectors if d.region is not None})
+
+        for d in detectors:
+            if d.method not in ("template", "digits"):
+                raise ValueError(f"Detector '{d.name}' has unknown method '{d.method}'.")
+        self.matchers = [d for d in detectors if d.method == "template"]
+        self.queries = [(d.template, self.rects[d.name], d.threshold) for d in self.matchers]
+        self.readers = [d for d in detectors if d.method == "digits"]
+
+    def run(self, vision, frame_bus, track=True):
+        """
+        Evaluates every detector on one capture and records each one's score,
+        verdict and cost in vision.telemetry.
+        """
+        frame = frame_bus.tick_screen() if self.full_screen else frame_bus.tick(self.region_names)
+        telemetry = vision.telemetry
+
+        results = {}
+        if self.queries:
+            start = time.perf_counter()
+            matches = vision.find_templates(self.queries, frame=frame, track=track)
+            # The regions are matched together (possibly in parallel), so the detectors split the cost
+            share = (time.perf_counter() - start) / len(self.queries)
+            for d, match in zip(self.matchers, matches):
+                results[d.name] = match
+                telemetry.record(d.name, match.score, match.hit, share, d.threshold)
+
+        for d in self.readers:
+            start = time.perf_counter()
+            reading = results[d.name] = vision.read_bait_count(self.rects[d.name], d.threshold, frame)
+            telemetry.record(d.name, reading.confidence, reading.hit, time.perf_counter() - start, d.threshold)
+
+        return {d.name: results[d.name] for d in self.detectors}
+
+
+class DetectorPlanner:
+    """
+    Compiles Config.DETECTOR_PLANS into ExecutionPlans and runs them.
+
+    Plans are cached per detector list and layout; call invalidate()
+    after editing the registry or its config.json overrides.
+    """
+
+    def __init__(self, vision, frame_bus):
+        self.vision = vision
+        self.frame_bus = frame_bus
+        self._plans = {}
+        self._lock = threading.Lock()
+
+    def compile(self, names):
+        """Returns the (cached) ExecutionPlan for a list of detector names."""
+        key = (tuple(names), cfg.screen_width, cfg.screen_height, cfg.scale, cfg.layout_offset)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                plan = self._plans[key] = ExecutionPlan([Detector.from_config(name) for name in names])
+            return plan
+
+    def plan_for(self, state):
+        if state not in cfg.DETECTOR_PLANS:
+            raise KeyError(f"No detector plan for state '{state}'.")
+        return self.compile(cfg.DETECTOR_PLANS[state])
+
+    def run(self, state, track=True):
+        """Runs the detectors of a worker state (a Config.DETECTOR_PLANS key)."""
+        return self.plan_for(state).run(self.vision, self.frame_bus, track)
+
+    def run_detectors(self, names, track=True):
+        """Runs an ad-hoc list of detectors as one plan."""
+        return self.compile(names).run(self.vision, self.frame_bus, track)
+
+    def invalidate(self):
+        with self._lock:
+            self._plans.clear()
+
+
+# Shared by all workers so plans are compiled once
+planner = DetectorPlanner(vision, frame_bus)
@@ -0,0 +1,64 @@
+import threading
+
+from src.capture import bounding_box
+from src.config import cfg
+from src.vision import vision
+
+
+class FrameBus:
+    """
+    Grabs the bounding box of all active regions once per tick.
+
+    FishingWorker, PopupWorker and the debug overlay all read from the latest
+    frame, so every decision in one tick is made on the same pixels. A frame
+    younger than `max_age` that already covers the requested regions is
+    handed out again instead of triggering another capture.
+    """
+
+    # Frames older than this (seconds) are never reused
+    MAX_FRAME_AGE = 0.05
+
+    def __init__(self, vision, max_age=MAX_FRAME_AGE):
+        self.vision = vision
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._latest = None
+        self.tick_count = 0
+        self.grab_count = 0
+
+    def tick(self, names=None):
+        """
+        Returns a frame covering the named regions of cfg.REGIONS
+        (all of them if `names` is None), capturing only if needed.
+        """
+        if names is None:
+            names = cfg.REGIONS.keys()
+        bbox = bounding_box([cfg.get_rect(name) for name in names])
+        return self._get_frame(bbox)
+
+    def tick_screen(self):
+        """Returns a frame covering the whole primary monitor."""
+        return self._get_frame(None)
+
+    def latest(self):
+        return self._latest
+
+    def _get_frame(self, bbox):
+        with self._lock:
+            self.tick_count += 1
+            frame = self._latest
+            if frame is not None and frame.age <= self.max_age and frame.contains(bbox):
+                return frame
+
+            frame = self.vision.grab_frame(bbox)
+            self._latest = frame
+            self.grab_count += 1
+            return frame
+
+    def stats(self):
+        """Number of ticks served and how many of them needed a real capture."""
+        return {'ticks': self.tick_count, 'grabs': self.grab_count}
+
+
+# Shared by all workers so they can reuse each other's frames
+frame_bus = FrameBus(vision)
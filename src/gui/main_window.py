@@ -6,6 +6,7 @@ from qfluentwidgets import FluentIcon, FluentWindow, NavigationItemPosition, set
 from src.gui.home_interface import HomeInterface
 from src.gui.records_interface import RecordsInterface
 from src.gui.settings_interface import SettingsInterface
+from src.gui.telemetry_interface import TelemetryInterface
 from src.gui.overlay_window import OverlayWindow
 from src.workers import FishingWorker, PopupWorker
 from src.inputs import InputController
@@ -44,6 +45,7 @@ class MainWindow(FluentWindow):
         self.home_interface = HomeInterface(self)
         self.records_interface = RecordsInterface(self)
         self.settings_interface = SettingsInterface(self)
+        self.telemetry_interface = TelemetryInterface(self)
  
         self.overlay = OverlayWindow()
 
@@ -56,6 +58,7 @@ class MainWindow(FluentWindow):
         # 添加导航
         self.addSubInterface(self.home_interface, FluentIcon.HOME, "主页")
         self.addSubInterface(self.records_interface, FluentIcon.LIBRARY, "记录")
+        self.addSubInterface(self.telemetry_interface, FluentIcon.SPEED_HIGH, "遥测")
         self.addSubInterface(self.settings_interface, FluentIcon.SETTING, "设置", NavigationItemPosition.BOTTOM)
 
         print("Connecting signals...")
@@ -0,0 +1,113 @@
+from datetime import datetime
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QHeaderView, QTableWidgetItem
+from PySide6.QtCore import Qt, QTimer
+from qfluentwidgets import TableWidget, PushButton, PrimaryPushButton, BodyLabel, FluentIcon, InfoBar, InfoBarPosition
+from src.config import cfg
+from src.vision import vision
+
+# Unicode block characters for the inline score histogram
+SPARK_CHARS = " ▁▂▃▄▅▆▇█"
+
+
+def sparkline(counts):
+    """Renders histogram counts as a one-line bar chart."""
+    peak = max(counts) if counts else 0
+    if not peak:
+        return ""
+    return "".join(SPARK_CHARS[round(count / peak * (len(SPARK_CHARS) - 1))] for count in counts)
+
+
+class TelemetryInterface(QWidget):
+    """
+    检测遥测: 每个检测项的匹配分数分布、命中率与耗时 (最近 N 次)
+    """
+
+    COLUMNS = ['检测项', '调用', '命中率', '阈值', '最低分', '平均分', '最高分',
+               '分数分布 (0 → 1)', 'P50 ms', 'P90 ms', 'P99 ms', '累计 ms']
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.setObjectName('telemetryInterface')
+        self.vBoxLayout = QVBoxLayout(self)
+
+        # --- Top Controls ---
+        top_layout = QHBoxLayout()
+        self.summary_label = BodyLabel(f"最近 {vision.telemetry.window} 次检测的统计, 每秒刷新", self)
+        top_layout.addWidget(self.summary_label)
+        top_layout.addStretch(1)
+        self.reset_button = PushButton(FluentIcon.DELETE, "清空", self)
+        self.reset_button.clicked.connect(self._reset)
+        top_layout.addWidget(self.reset_button)
+        self.export_button = PrimaryPushButton(FluentIcon.SAVE, "导出 JSON", self)
+        self.export_button.clicked.connect(self._export)
+        top_layout.addWidget(self.export_button)
+        self.vBoxLayout.addLayout(top_layout)
+
+        # --- Table ---
+        self.table = TableWidget(self)
+        self.table.setColumnCount(len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setBorderVisible(True)
+        self.table.setBorderRadius(8)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.vBoxLayout.addWidget(self.table)
+
+        # Only refresh while the page is visible
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def refresh(self):
+        snapshot = vision.telemetry.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (name, stats) in enumerate(snapshot.items()):
+            score = stats['score']
+            latency = stats['latency_ms']
+            values = [
+                name,
+                str(stats['calls']),
+                f"{stats['hit_rate']:.1%}",
+                "-" if stats['threshold'] is None else f"{stats['threshold']:.2f}",
+                "-" if score['min'] is None else f"{score['min']:.3f}",
+                "-" if score['mean'] is None else f"{score['mean']:.3f}",
+                "-" if score['max'] is None else f"{score['max']:.3f}",
+                sparkline(stats['histogram']),
+                f"{latency['p50']:.3f}",
+                f"{latency['p90']:.3f}",
+                f"{latency['p99']:.3f}",
+                f"{stats['total_ms']:.1f}",
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def _reset(self):
+        vision.telemetry.reset()
+        self.refresh()
+
+    def _export(self):
+        """导出到 data/telemetry_<时间>.json"""
+        data_dir = cfg._get_base_path() / 'data'
+        data_dir.mkdir(parents=True, exist_ok=True)
+        path = data_dir / f"telemetry_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        try:
+            vision.telemetry.dump_json(path)
+        except OSError as e:
+            InfoBar.error(title="导出失败", content=str(e), duration=3000,
+                          position=InfoBarPosition.TOP, parent=self.window())
+            return
+        InfoBar.success(title="导出成功", content=str(path), duration=3000,
+                        position=InfoBarPosition.TOP, parent=self.window())
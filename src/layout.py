@@ -0,0 +1,220 @@
+import time
+from dataclasses import dataclass, asdict
+
+import cv2
+import numpy as np
+
+from src.config import cfg
+
+# Prompt icon shown next to the rod whenever the game waits for input. The
+# F1 and F2 prompts share it (their template files are identical), so the
+# anchors are its distinct positions: bite prompt, cast prompt, ice cast prompt
+ANCHOR_TEMPLATE = 'F1_grayscale'
+# Regions an anchor can appear in, all based on 2560x1440
+ANCHOR_REGIONS = ('cast_rod', 'cast_rod_ice', 'wait_bite')
+# UI scales searched, relative to 2560x1440 (0.4 = 576p, 2.0 = 2880p)
+SCALE_MIN = 0.4
+SCALE_MAX = 2.0
+COARSE_STEP = 0.05
+FINE_STEP = 0.01
+# Templates smaller than this carry too little detail to match reliably
+MIN_TEMPLATE_SIDE = 8
+# Largest downsampling factor of the coarse sweep
+MAX_FACTOR = 4
+MIN_SCORE = 0.8
+# A 25x32 icon matches almost as well a few sizes too small as at its true
+# size (0.905 at 0.94 vs 0.842 at 1.0 on a 1440p capture), so the size nearest
+# the resolution's scale wins among those within this much of the best score
+SCORE_MARGIN = 0.08
+# Screen position each REGIONS anchor type measures from, as a fraction of
+# the screen's width and height
+ANCHOR_POINTS = {
+    "top_center": (0.5, 0.0),
+    "bottom_center": (0.5, 1.0),
+    "bottom_right": (1.0, 1.0),
+    "center": (0.5, 0.5),
+}
+
+
+@dataclass(frozen=True)
+class LayoutProfile:
+    """Measured UI layout of one screen resolution."""
+    width: int
+    height: int
+    scale: float
+    offset_x: int
+    offset_y: int
+    score: float  # anchor match score the profile was derived from
+    anchors: int  # distinct anchor locations found
+    created: float
+
+    @property
+    def key(self):
+        return f"{self.width}x{self.height}"
+
+    def to_config(self):
+        return asdict(self)
+
+
+def _load_anchor(name):
+    """Decodes an anchor template at its native 2560x1440 size."""
+    path = cfg._get_base_path() / 'resources' / f'{name}.png'
+    try:
+        return cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    except OSError:
+        return None
+
+
+def _sizes(template, scales):
+    """Distinct (width, height) of `template` over `scales`, smallest first."""
+    h, w = template.shape
+    sizes = {(round(w * scale), round(h * scale)) for scale in scales}
+    return sorted(size for size in sizes if min(size) >= MIN_TEMPLATE_SIDE)
+
+
+def _sweep(gray, template, sizes, downsample=True):
+    """
+    (score, (width, height), (x, y)) of the best match of `template` resized
+    to each of `sizes` in `gray`. With `downsample`, image and template are
+    shrunk together as far as the template stays MIN_TEMPLATE_SIDE wide,
+    which cuts the cost of each match by the square of the factor.
+    """
+    shrunk = {1: gray}
+    results = []
+    for w, h in sizes:
+        factor = min(max(min(w, h) // MIN_TEMPLATE_SIDE, 1), MAX_FACTOR) if downsample else 1
+        image = shrunk.get(factor)
+        if image is None:
+            size = (gray.shape[1] // factor, gray.shape[0] // factor)
+            image = shrunk[factor] = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+        scaled = cv2.resize(template, (round(w / factor), round(h / factor)), interpolation=cv2.INTER_AREA)
+        if scaled.shape[0] > image.shape[0] or scaled.shape[1] > image.shape[1]:
+            continue
+        result = cv2.matchTemplate(image, scaled, cv2.TM_CCOEFF_NORMED)
+        _, score, _, loc = cv2.minMaxLoc(result)
+        results.append((score, (w, h), (loc[0] * factor, loc[1] * factor)))
+    return results
+
+
+def _pick(results, height):
+    """The result nearest `height` among those within SCORE_MARGIN of the best."""
+    if not results:
+        return -1.0, None, None
+    best = max(score for score, _, _ in results)
+    return min((r for r in results if r[0] >= best - SCORE_MARGIN),
+               key=lambda r: (abs(r[1][1] - height), -r[0]))
+
+
+def find_anchor(gray, template, expected):
+    """
+    Multi-scale search for one anchor. A coarse sweep covers the whole scale
+    range on downsampled copies of the image; a fine sweep then tries every
+    template size around the coarse winner at full resolution, in a window
+    around its location. Both sweeps prefer the size nearest the `expected`
+    scale among near-best matches (see SCORE_MARGIN). Returns (score, scale,
+    (x, y)); the scale is the matched template height over the native one,
+    so it reproduces that size.
+    """
+    h, w = template.shape
+    coarse = _sizes(template, np.arange(SCALE_MIN, SCALE_MAX + 1e-9, COARSE_STEP))
+    _, size, loc = _pick(_sweep(gray, template, coarse), h * expected)
+    if size is None:
+        return -1.0, None, None
+
+    scale = size[1] / h
+    fine = _sizes(template, np.arange(scale - COARSE_STEP, scale + COARSE_STEP + 1e-9, FINE_STEP))
+    # Window: the coarse location (off by up to a downsampling step) plus the largest candidate
+    margin = MAX_FACTOR + max(fine[-1]) - min(size)
+    x0, y0 = max(loc[0] - margin, 0), max(loc[1] - margin, 0)
+    x1 = min(loc[0] + max(fine[-1]) + margin, gray.shape[1])
+    y1 = min(loc[1] + max(fine[-1]) + margin, gray.shape[0])
+    score, size, loc = _pick(_sweep(gray[y0:y1, x0:x1], template, fine, downsample=False), h * expected)
+    if size is None:
+        return -1.0, None, None
+    return score, round(size[1] / h, 4), (loc[0] + x0, loc[1] + y0)
+
+
+def _locate(gray, template, scale, min_score):
+    """
+    (score, (x, y)) of every distinct spot, up to one per anchor region,
+    where `template` at `scale` matches at least `min_score`; best first.
+    """
+    h, w = template.shape
+    size = (round(w * scale), round(h * scale))
+    scaled = cv2.resize(template, size, interpolation=cv2.INTER_AREA)
+    result = cv2.matchTemplate(gray, scaled, cv2.TM_CCOEFF_NORMED)
+    found = []
+    while len(found) < len(ANCHOR_REGIONS):
+        _, score, _, (x, y) = cv2.minMaxLoc(result)
+        if score < min_score:
+            break
+        found.append((score, (x, y)))
+        # Blank out every placement overlapping this one
+        result[max(y - size[1], 0):y + size[1], max(x - size[0], 0):x + size[0]] = -1.0
+    return found
+
+
+def _expected_centers(scale):
+    """
+    Anchor region centers the current screen size predicts at `scale`,
+    without a layout offset. Mirrors cfg's anchored rects, computed here so
+    that the regions in use are never touched.
+    """
+    centers = []
+    for name in ANCHOR_REGIONS:
+        x, y, w, h = cfg.REGIONS[name]["coords"]
+        fx, fy = ANCHOR_POINTS[cfg.REGIONS[name]["anchor"]]
+        centers.append((fx * cfg.screen_width + (x + w / 2 - fx * cfg.BASE_SCREEN_WIDTH) * scale,
+                        fy * cfg.screen_height + (y + h / 2 - fy * cfg.BASE_SCREEN_HEIGHT) * scale))
+    return centers
+
+
+def calibrate(image, min_score=MIN_SCORE):
+    """
+    Derives the UI scale and offset from one full-screen capture (BGRA or
+    grayscale, at cfg's screen size) showing a cast or bite prompt. Returns a
+    LayoutProfile, or None when no anchor matches at least `min_score`.
+
+    The scale comes from the anchor search, biased towards the scale of the
+    screen's resolution; the offset is how far the anchors sit from where cfg
+    places their regions at that scale, averaged over every anchor found.
+    Each anchor is attributed to the nearest region, so offsets beyond half
+    the spacing between the prompts (about 55 px at 1440p) cannot be told
+    apart.
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    height, width = gray.shape
+    if (width, height) != (cfg.screen_width, cfg.screen_height):
+        raise ValueError(f"Capture is {width}x{height}, screen is {cfg.layout_key()}.")
+    template = _load_anchor(ANCHOR_TEMPLATE)
+    if template is None:
+        return None
+    score, scale, _ = find_anchor(gray, template, height / cfg.BASE_SCREEN_HEIGHT)
+    if scale is None or score < min_score:
+        return None
+    found = _locate(gray, template, scale, min_score)
+    if not found:
+        return None
+
+    centers = _expected_centers(scale)
+    h, w = template.shape
+    offsets = []
+    for _, (x, y) in found:
+        cx, cy = x + w * scale / 2, y + h * scale / 2
+        ex, ey = min(centers, key=lambda c: (c[0] - cx) ** 2 + (c[1] - cy) ** 2)
+        offsets.append((cx - ex, cy - ey))
+    offset_x, offset_y = np.mean(offsets, axis=0)
+    return LayoutProfile(width, height, scale, int(round(offset_x)), int(round(offset_y)),
+                         round(float(found[0][0]), 4), len(found), time.time())
+
+
+def apply_profile(profile, save=True):
+    """
+    Stores the profile under its resolution and applies it if that is the
+    current screen size. Callers must reload templates afterwards.
+    """
+    cfg.layout_profiles[profile.key] = profile.to_config()
+    if profile.key == cfg.layout_key():
+        cfg.apply_layout(profile.scale, profile.offset_x, profile.offset_y)
+    if save:
+        cfg.save()
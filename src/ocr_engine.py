@@ -0,0 +1,266 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import cv2
+import numpy as np
+import onnxruntime
+from rapidocr_onnxruntime import RapidOCR
+
+from src.config import cfg
+
+# Fast mode line segmentation, in pixels at 1440p
+LINE_MIN_HEIGHT_BASE = 8
+LINE_MERGE_GAP_BASE = 3
+LINE_PADDING_BASE = 4
+# More rows than this is background texture, not the catch popup
+MAX_LINES = 6
+
+# ONNX Runtime settings of the det/cls/rec sessions, as RapidOCR builds them;
+# config.json global_settings["ocr_session"] overrides single keys and only
+# then are the sessions rebuilt. 0 threads = ONNX Runtime's default (one per core).
+DEFAULT_SESSION_OPTIONS = {
+    "intra_op_threads": 0,
+    "inter_op_threads": 0,
+    "execution_mode": "sequential",  # "sequential" or "parallel" (recent runtimes may run sequentially anyway)
+    "graph_optimization": "all",  # "disabled", "basic", "extended" or "all"
+    "cpu_mem_arena": False,
+}
+EXECUTION_MODES = {
+    "sequential": onnxruntime.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": onnxruntime.ExecutionMode.ORT_PARALLEL,
+}
+GRAPH_OPTIMIZATIONS = {
+    "disabled": onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+def rec_model_path(path=None):
+    """
+    Recognition model to load: `path`, or config.json
+    global_settings["ocr_rec_model"] when None. Relative paths are resolved
+    against the application directory. Returns None (RapidOCR's bundled
+    model) for an empty setting or a missing file.
+    """
+    if path is None:
+        path = cfg.global_settings.get("ocr_rec_model", "")
+    if not path:
+        return None
+    path = Path(path)
+    if not path.is_absolute():
+        path = cfg._get_base_path() / path
+    if not path.exists():
+        print(f"OCR recognition model {path} not found, using the bundled model")
+        return None
+    return str(path)
+
+
+def _warmup_image():
+    """A catch-popup sized image with text, so detection, classification and recognition all run."""
+    _, _, w, h = cfg.get_rect("ocr_area")
+    image = np.zeros((max(h, 48), max(w, 160), 3), np.uint8)
+    cv2.putText(image, "12.5 kg", (10, image.shape[0] * 2 // 3), cv2.FONT_HERSHEY_SIMPLEX,
+                image.shape[0] / 100, (255, 255, 255), 2)
+    return image
+
+
+def session_options(overrides=None):
+    """DEFAULT_SESSION_OPTIONS updated with config.json and then `overrides`."""
+    options = dict(DEFAULT_SESSION_OPTIONS)
+    options.update(cfg.global_settings.get("ocr_session", {}))
+    options.update(overrides or {})
+    for key, choices in (("execution_mode", EXECUTION_MODES), ("graph_optimization", GRAPH_OPTIMIZATIONS)):
+        if options[key] not in choices:
+            raise ValueError(f"ocr_session.{key} must be one of {', '.join(choices)}, got '{options[key]}'.")
+    return options
+
+
+def _session_wrappers(engine):
+    """
+    [(ORT wrapper, model path)] of the detector, classifier and recognizer of
+    rapidocr_onnxruntime 1.x, or None when this RapidOCR lays them out differently.
+    """
+    try:
+        wrappers = [engine.text_det.infer, engine.text_cls.infer, engine.text_rec.session]
+        return [(infer, infer.session._model_path) for infer in wrappers]
+    except AttributeError:
+        return None
+
+
+def build_engine(overrides=None, rec_model=None):
+    """
+    Constructs RapidOCR with the configured session options and recognition
+    model (see rec_model_path). RapidOCR hard-codes everything but the thread
+    counts (and ignores those above the core count), so when options are
+    configured its det/cls/rec sessions are rebuilt from the same models.
+    If its internals aren't the expected ones, the engine is constructed again
+    with just the thread counts instead.
+    """
+    options = session_options(overrides)
+    rec_path = rec_model_path(rec_model)
+    model_kwargs = {"rec_model_path": rec_path} if rec_path else {}
+    engine = RapidOCR(**model_kwargs)
+    if options == DEFAULT_SESSION_OPTIONS:
+        return engine
+
+    # More threads than cores only adds contention
+    intra_threads = min(int(options["intra_op_threads"]), os.cpu_count() or 1)
+    inter_threads = int(options["inter_op_threads"])
+    sessions = _session_wrappers(engine)
+    if sessions is None:
+        print("OCR sessions can't be rebuilt with this RapidOCR version; applying only the thread counts")
+        # RapidOCR's own parameters, where -1 keeps ONNX Runtime's default
+        return RapidOCR(intra_op_num_threads=intra_threads or -1, inter_op_num_threads=inter_threads or -1,
+                        **model_kwargs)
+
+    sess_opt = onnxruntime.SessionOptions()
+    sess_opt.log_severity_level = 4
+    sess_opt.intra_op_num_threads = intra_threads
+    sess_opt.inter_op_num_threads = inter_threads
+    sess_opt.execution_mode = EXECUTION_MODES[options["execution_mode"]]
+    sess_opt.graph_optimization_level = GRAPH_OPTIMIZATIONS[options["graph_optimization"]]
+    sess_opt.enable_cpu_mem_arena = bool(options["cpu_mem_arena"])
+    for infer, model_path in sessions:
+        old = infer.session
+        provider_options = old.get_provider_options()
+        providers = [(name, provider_options.get(name, {})) for name in old.get_providers()]
+        infer.session = onnxruntime.InferenceSession(model_path, sess_options=sess_opt, providers=providers)
+    return engine
+
+
+def segment_lines(image):
+    """
+    Finds the text lines of a BGR crop from the row and column projection
+    profiles of its Otsu binarization. Returns [(x, y, w, h)], or [] when the
+    crop doesn't look like a few lines of text on a plain background.
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    _, binary = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Text is the minority class, whichever its polarity
+    if binary.mean() > 0.5:
+        binary = 1 - binary
+
+    min_height = max(int(LINE_MIN_HEIGHT_BASE * cfg.scale), 4)
+    merge_gap = max(int(LINE_MERGE_GAP_BASE * cfg.scale), 1)
+    padding = max(int(LINE_PADDING_BASE * cfg.scale), 2)
+    h, w = binary.shape
+
+    # Rows holding any ink, with short gaps (dots, accents) closed
+    rows = np.flatnonzero(binary.sum(axis=1) > 0)
+    bands = []
+    for y in rows:
+        if bands and y - bands[-1][1] <= merge_gap + 1:
+            bands[-1][1] = y
+        else:
+            bands.append([y, y])
+    bands = [(top, bottom + 1) for top, bottom in bands if bottom + 1 - top >= min_height]
+    if not bands or len(bands) > MAX_LINES or any(bottom - top > h * 0.8 for top, bottom in bands):
+        return []
+
+    boxes = []
+    for top, bottom in bands:
+        columns = np.flatnonzero(binary[top:bottom].sum(axis=0) > 0)
+        x0, x1 = max(columns[0] - padding, 0), min(columns[-1] + 1 + padding, w)
+        y0, y1 = max(top - padding, 0), min(bottom + padding, h)
+        boxes.append((int(x0), int(y0), int(x1 - x0), int(y1 - y0)))
+    return boxes
+
+
+def recognize_lines(engine, image, boxes, min_confidence):
+    """
+    Recognizes each line box with detection and angle classification off.
+    Returns a RapidOCR-style [[box, text, score], ...], or None as soon as a
+    line scores below `min_confidence`.
+    """
+    result = []
+    for x, y, w, h in boxes:
+        lines, _ = engine(image[y:y + h, x:x + w], use_det=False, use_cls=False)
+        if not lines:
+            return None
+        text, score = lines[0]
+        if score < min_confidence or not text.strip():
+            return None
+        result.append([[[x, y], [x + w, y], [x + w, y + h], [x, y + h]], text.strip(), score])
+    return result
+
+
+def read_text(engine, image, mode=None):
+    """
+    OCR of a BGR crop. Returns (RapidOCR result list or None, mode used).
+
+    In "fast" mode the projection-segmented lines go straight to the
+    recognizer; when segmentation fails or a line scores below
+    ocr_fast_min_confidence, the crop is read again with "full" detection.
+    """
+    if mode is None:
+        mode = cfg.global_settings.get("ocr_mode", "fast")
+    if mode == "fast":
+        boxes = segment_lines(image)
+        if boxes:
+            result = recognize_lines(engine, image, boxes,
+                                     cfg.global_settings.get("ocr_fast_min_confidence", 0.8))
+            if result is not None:
+                return result, "fast"
+    result, _ = engine(image)
+    return result, "full"
+
+
+class OcrEngine:
+    """
+    RapidOCR built on a background thread.
+
+    Constructing RapidOCR loads the ONNX models and its first inference still
+    initializes lazily, together a few seconds. start() does both on a
+    daemon thread with one dummy inference; get() returns the engine, only
+    blocking if the warm-up has not finished yet.
+    """
+
+    def __init__(self):
+        self._future = None
+        self._lock = threading.Lock()
+        self.load_time = None  # seconds spent constructing and warming up
+
+    def start(self):
+        """Starts the warm-up unless it is already running; returns its Future."""
+        with self._lock:
+            if self._future is None:
+                self._future = Future()
+                threading.Thread(target=self._load, name="ocr-warmup", daemon=True).start()
+            return self._future
+
+    def _load(self):
+        start = time.perf_counter()
+        model = rec_model_path()
+        try:
+            # "" keeps the bundled model if the configured one is missing
+            engine = build_engine(rec_model=model or "")
+            engine(_warmup_image())
+        except Exception as e:
+            print(f"OCR warm-up failed: {e}")
+            self._future.set_exception(e)
+            return
+        self.load_time = time.perf_counter() - start
+        print(f"OCR engine ready in {self.load_time:.2f} s "
+              f"(recognition model {Path(model).name if model else 'bundled'})")
+        self._future.set_result(engine)
+
+    def read(self, image, mode=None):
+        """read_text() with the warmed-up engine."""
+        return read_text(self.get(), image, mode)
+
+    @property
+    def ready(self):
+        return self._future is not None and self._future.done()
+
+    def get(self, timeout=None):
+        """Returns the warmed-up RapidOCR; raises the warm-up's exception if it failed."""
+        return self.start().result(timeout)
+
+
+# Shared by all workers so the models are loaded once
+ocr_engine = OcrEngine()
@@ -0,0 +1,229 @@
+import hashlib
+import threading
+import time
+import cv2
+import numpy as np
+from collections import OrderedDict
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+def fingerprint(image):
+    """
+    Fast 64-bit hash of a C-contiguous image buffer. Uses xxhash when it is
+    installed and falls back to blake2b otherwise.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(image)
+    return hashlib.blake2b(image, digest_size=8).digest()
+
+
+class CropCache:
+    """
+    Bounded LRU cache of recognition results keyed on a crop fingerprint.
+
+    While waiting for a bite the bait counter and the prompt icons stay
+    pixel-identical for tens of seconds, so the last verdict for the same
+    pixels is returned instead of running the matcher again.
+    """
+
+    MISSING = object()
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns the cached value, or CropCache.MISSING."""
+        with self._lock:
+            value = self._entries.get(key, self.MISSING)
+            if value is self.MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+def block_signature(image, block=8):
+    """
+    Perceptual signature of a crop: the grayscale mean of every block x block
+    cell. Unlike fingerprint() it tolerates capture noise, and unlike a 64-bit
+    perceptual hash it still changes visibly when a single digit does.
+    """
+    if image.ndim == 3:
+        code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        image = cv2.cvtColor(image, code)
+    h, w = image.shape
+    size = (max(w // block, 1), max(h // block, 1))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+class RecentCrops:
+    """
+    Short-lived memory of results for crops seen in the last `ttl` seconds.
+
+    Crops are compared by block_signature(): two crops match when no cell
+    mean differs by more than `tolerance` gray levels, so a re-capture of the
+    same popup matches while a card with one different digit does not.
+    Entries expire `ttl` seconds after they were stored; a match does not
+    extend them.
+    """
+
+    MISSING = CropCache.MISSING
+
+    def __init__(self, ttl=15.0, tolerance=8, block=8):
+        self.ttl = ttl
+        self.tolerance = tolerance
+        self.block = block
+        self._entries = []  # [signature, value, stored at]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, image):
+        """Returns (signature, value) of the matching entry, value being RecentCrops.MISSING if none."""
+        signature = block_signature(image, self.block)
+        now = time.monotonic()
+        with self._lock:
+            self._entries = [e for e in self._entries if now - e[2] <= self.ttl]
+            for entry in self._entries:
+                if entry[0].shape == signature.shape and np.abs(entry[0] - signature).max() <= self.tolerance:
+                    self.hits += 1
+                    return signature, entry[1]
+            self.misses += 1
+        return signature, self.MISSING
+
+    def put(self, signature, value):
+        """Stores `value` for a signature from lookup(), replacing that signature's earlier value."""
+        with self._lock:
+            for entry in self._entries:
+                if entry[0] is signature:
+                    entry[1] = value
+                    return
+            self._entries.append([signature, value, time.monotonic()])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+class _GateEntry:
+    __slots__ = ('reference', 'scratch', 'verdict', 'cost')
+
+    def __init__(self, shape, dtype):
+        self.reference = np.empty(shape, dtype)
+        self.scratch = np.empty(shape, dtype)
+        self.verdict = None
+        self.cost = 0.0
+
+
+class ChangeGate:
+    """
+    Per-region change detector that sits in front of the matchers.
+
+    Keeps a downsampled reference of every region as it looked when its last
+    verdict was computed. A new crop whose mean absolute difference to that
+    reference stays below `threshold` (in gray levels) reuses the verdict, so
+    capture noise and subtle animation don't re-run recognition. Unlike the
+    CropCache this tolerates small pixel differences; the reference is only
+    refreshed together with the verdict, so slow drift still adds up to a
+    recompute.
+    """
+
+    MISSING = CropCache.MISSING
+
+    def __init__(self, threshold=4.0, factor=2):
+        self.threshold = threshold
+        self.factor = factor
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.skips = 0
+        # Sum of the last measured matcher cost for every skipped call
+        self.time_saved = 0.0
+
+    def _small_shape(self, image):
+        height = max(1, image.shape[0] // self.factor)
+        width = max(1, image.shape[1] // self.factor)
+        return (height, width) + image.shape[2:]
+
+    def _downsample(self, image, out):
+        cv2.resize(image, (out.shape[1], out.shape[0]), dst=out, interpolation=cv2.INTER_AREA)
+
+    def check(self, key, image):
+        """Returns the previous verdict if `image` hasn't visibly changed, else ChangeGate.MISSING."""
+        with self._lock:
+            self.checks += 1
+            entry = self._entries.get(key)
+            if entry is None or entry.reference.shape != self._small_shape(image):
+                return self.MISSING
+            self._downsample(image, entry.scratch)
+            difference = cv2.norm(entry.scratch, entry.reference, cv2.NORM_L1) / entry.scratch.size
+            if difference >= self.threshold:
+                return self.MISSING
+            self.skips += 1
+            self.time_saved += entry.cost
+            return entry.verdict
+
+    def update(self, key, image, verdict, cost):
+        """Stores the verdict computed for `image` and how long it took (seconds)."""
+        with self._lock:
+            shape = self._small_shape(image)
+            entry = self._entries.get(key)
+            if entry is None or entry.reference.shape != shape:
+                entry = self._entries[key] = _GateEntry(shape, image.dtype)
+            self._downsample(image, entry.reference)
+            entry.verdict = verdict
+            entry.cost = cost
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'regions': len(self._entries),
+                'checks': self.checks,
+                'skips': self.skips,
+                'skip_ratio': self.skips / self.checks if self.checks else 0.0,
+                'time_saved': self.time_saved,
+            }
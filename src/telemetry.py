@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+
+import numpy as np
+
+
+class _Window:
+    """Fixed-size ring buffers of the latest samples of one detector."""
+
+    def __init__(self, size):
+        self.scores = np.zeros(size, np.float32)
+        self.hits = np.zeros(size, bool)
+        self.latencies = np.zeros(size, np.float32)
+        self.count = 0  # samples recorded in total
+        self.total_time = 0.0
+        self.threshold = None
+
+    def add(self, score, hit, seconds):
+        index = self.count % len(self.scores)
+        self.scores[index] = score
+        self.hits[index] = hit
+        self.latencies[index] = seconds
+        self.count += 1
+        self.total_time += seconds
+
+    def samples(self):
+        n = min(self.count, len(self.scores))
+        return self.scores[:n], self.hits[:n], self.latencies[:n]
+
+
+class MatchTelemetry:
+    """
+    Rolling per-detector statistics: score histograms, hit rates and latency
+    percentiles over the last `window` evaluations of each detector.
+
+    Recording writes into preallocated ring buffers, so it is cheap enough to
+    stay on in the polling loops; summaries are only computed on snapshot().
+    """
+
+    def __init__(self, window=1000, bins=20):
+        self.window = window
+        # Histogram bins over [0, 1]; negative scores land in the first bin
+        self.bin_edges = np.linspace(0.0, 1.0, bins + 1)
+        self._windows = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def record(self, name, score, hit, seconds, threshold=None):
+        with self._lock:
+            window = self._windows.get(name)
+            if window is None:
+                window = self._windows[name] = _Window(self.window)
+            window.add(score, hit, seconds)
+            if threshold is not None:
+                window.threshold = threshold
+
+    def reset(self):
+        with self._lock:
+            self._windows.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """Returns {detector name: summary dict} for everything recorded so far."""
+        with self._lock:
+            windows = {
+                name: (w.count, w.total_time, w.threshold, *[a.copy() for a in w.samples()])
+                for name, w in self._windows.items()
+            }
+
+        summary = {}
+        for name, (count, total_time, threshold, scores, hits, latencies) in sorted(windows.items()):
+            histogram, _ = np.histogram(np.clip(scores, 0.0, 1.0), bins=self.bin_edges)
+            latency_ms = latencies * 1000
+            summary[name] = {
+                'calls': count,
+                'window': int(len(scores)),
+                'threshold': threshold,
+                'hit_rate': float(hits.mean()) if len(hits) else 0.0,
+                'score': {
+                    'min': float(scores.min()) if len(scores) else None,
+                    'mean': float(scores.mean()) if len(scores) else None,
+                    'max': float(scores.max()) if len(scores) else None,
+                },
+                'histogram': histogram.tolist(),
+                'latency_ms': {
+                    'p50': float(np.percentile(latency_ms, 50)) if len(latency_ms) else 0.0,
+                    'p90': float(np.percentile(latency_ms, 90)) if len(latency_ms) else 0.0,
+                    'p99': float(np.percentile(latency_ms, 99)) if len(latency_ms) else 0.0,
+                    'max': float(latency_ms.max()) if len(latency_ms) else 0.0,
+                },
+                'total_ms': total_time * 1000,
+            }
+        return summary
+
+    def dump_json(self, path):
+        """Writes the snapshot (plus the histogram bin edges) to `path`."""
+        data = {
+            'started': self.started,
+            'dumped': time.time(),
+            'bin_edges': self.bin_edges.tolist(),
+            'detectors': self.snapshot(),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
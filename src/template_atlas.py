@@ -0,0 +1,95 @@
+import json
+import os
+
+import numpy as np
+
+ATLAS_MAGIC = b'AFATLAS1'
+ATLAS_VERSION = 1
+# Template data starts on an aligned offset so every array view is aligned too
+ATLAS_ALIGN = 64
+
+
+class TemplateAtlas:
+    """
+    Single-file cache of templates already scaled to cfg.scale.
+
+    Layout: magic, 4-byte header length, JSON header, padding, then the raw
+    uint8 pixels of every template back to back. The header stores the key
+    the atlas was built for (scale factor plus mtime/size of each source PNG)
+    and the shape/offset of each template. Loading only parses the header and
+    memory-maps the pixel data, so startup skips PNG decoding and resizing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def make_key(resources_path, names, scale):
+        """Describes the inputs an atlas is valid for."""
+        sources = {}
+        for name in names:
+            try:
+                st = os.stat(os.path.join(resources_path, f'{name}.png'))
+                sources[name] = [st.st_mtime_ns, st.st_size]
+            except OSError:
+                sources[name] = None
+        return {'version': ATLAS_VERSION, 'scale': scale, 'sources': sources}
+
+    def load(self, key):
+        """
+        Returns {name: read-only array} mapped from the atlas, or None if the
+        file is missing, corrupt or was built for different inputs.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                if f.read(len(ATLAS_MAGIC)) != ATLAS_MAGIC:
+                    return None
+                header_len = int.from_bytes(f.read(4), 'little')
+                header = json.loads(f.read(header_len).decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+
+        if header.get('key') != key:
+            return None
+
+        entries = header['entries']
+        if not entries:
+            return {}
+        data = np.memmap(self.path, dtype=np.uint8, mode='r', offset=header['data_offset'])
+        images = {}
+        for entry in entries:
+            shape = tuple(entry['shape'])
+            size = int(np.prod(shape))
+            images[entry['name']] = data[entry['offset']:entry['offset'] + size].reshape(shape)
+        return images
+
+    def save(self, key, images):
+        """Writes the atlas atomically. Returns False if it couldn't be written."""
+        entries = []
+        offset = 0
+        for name, img in images.items():
+            entries.append({'name': name, 'shape': list(img.shape), 'offset': offset})
+            offset += img.nbytes
+
+        header = {'key': key, 'entries': entries, 'data_offset': 0}
+        # data_offset depends on the header length, so size the header with a placeholder first
+        prefix_len = len(ATLAS_MAGIC) + 4 + len(json.dumps(header).encode('utf-8')) + 16
+        header['data_offset'] = -(-prefix_len // ATLAS_ALIGN) * ATLAS_ALIGN
+        header_bytes = json.dumps(header).encode('utf-8')
+        padding = header['data_offset'] - len(ATLAS_MAGIC) - 4 - len(header_bytes)
+
+        tmp_path = f'{self.path}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(ATLAS_MAGIC)
+                f.write(len(header_bytes).to_bytes(4, 'little'))
+                f.write(header_bytes)
+                f.write(b'\0' * padding)
+                for img in images.values():
+                    f.write(np.ascontiguousarray(img).tobytes())
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            print(f"Failed to write template atlas: {e}")
+            return False
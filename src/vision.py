@@ -1,17 +1,148 @@
 import cv2
 import numpy as np
-import mss
-import os
 import time
-import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from src.config import cfg
+from src.capture import Frame, MssBackend, bounding_box
+from src.template_atlas import TemplateAtlas
+from src.digit_recognizer import DigitReading, DigitRecognizer
+from src.correlation import PresenceMatcher
+from src.telemetry import MatchTelemetry
+from src.region_cache import ChangeGate, CropCache, fingerprint
+
+# Templates the detectors use; these are kept pre-scaled in the template atlas.
+# Anything else under resources/ is decoded on first use.
+TEMPLATE_NAMES = (
+    'F1_grayscale', 'F2_grayscale', 'star_grayscale', 'shangyu_grayscale', 'chang_grayscale',
+) + tuple(f'{i}_grayscale' for i in range(10))
+
+# Pixels (at 2560x1440) searched around the last hit of a tracked template
+TRACK_MARGIN_BASE = 8
+
+# Coarse-to-fine matching for large searches (full screen, region=None):
+# images with at least this many pixels are matched on a downscaled copy first
+PYRAMID_MIN_AREA = 640 * 360
+# Downscaled templates keep at least this many pixels on their short side
+PYRAMID_MIN_TEMPLATE_SIDE = 8
+PYRAMID_MAX_FACTOR = 4
+# Coarse peaks re-scored at full resolution
+PYRAMID_CANDIDATES = 3
+
+# Grayscale regions with at most this many template positions (cast prompts,
+# star, shangyu, jiashi popup) are scored with a PresenceMatcher instead of
+# cv2.matchTemplate
+PRESENCE_MAX_OFFSETS = 4
+
+# The change gate only answers searches the template covers at least this
+# fraction of: in larger ones (full screen, region=None) a template-sized
+# change barely moves the mean difference
+GATE_MIN_COVERAGE = 0.25
+
+# find_templates() only fans out to the match pool when the regions add up to
+# at least this many pixels; below that the thread handoff costs more than
+# the matching itself. Regions this large are also split per template, so the
+# precheck's two full-screen prompt searches run side by side.
+PARALLEL_MIN_PIXELS = 256 * 256
+
+
+@dataclass(frozen=True)
+class Template:
+    """
+    A template prepared once at load time, so matching only has to look it up.
+
+    `image` is what gets passed to matchTemplate: grayscale for *_grayscale
+    assets, BGR otherwise. Captures are converted with `color_code` into the
+    same color space before matching.
+    """
+    name: str
+    image: np.ndarray
+    gray: np.ndarray
+    mask: np.ndarray  # alpha channel of BGRA assets, else None
+    method: int
+    color_code: int
+    channels: int
+    width: int
+    height: int
+    center: tuple  # offset from the match location to the template center
+
+    @classmethod
+    def compile(cls, name, img):
+        """Builds the record from a decoded (and already scaled) image."""
+        mask = None
+        if img.ndim == 2:
+            # Grayscale template - match against a grayscale capture
+            image = img
+            gray = img
+            method, color_code, channels = cv2.TM_CCOEFF_NORMED, cv2.COLOR_BGRA2GRAY, 1
+        elif img.shape[2] == 4:
+            # Separate the alpha channel as a mask
+            image = img[:, :, :3]
+            mask = np.ascontiguousarray(img[:, :, 3])
+            gray = cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
+            method, color_code, channels = cv2.TM_CCORR_NORMED, cv2.COLOR_BGRA2BGR, 3
+        else:
+            # BGR Template
+            image = img
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+            method, color_code, channels = cv2.TM_CCOEFF_NORMED, cv2.COLOR_BGRA2BGR, 3
+
+        image = np.ascontiguousarray(image)
+        for arr in (image, gray, mask):
+            if arr is not None:
+                arr.flags.writeable = False
+
+        height, width = image.shape[:2]
+        return cls(name, image, gray, mask, method, color_code, channels,
+                   width, height, (width // 2, height // 2))
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """
+    Outcome of one template query. `center` is relative to the searched
+    region (like find_template) and refers to the best location even on a
+    miss; `hit` says whether `score` reached the threshold.
+    """
+    template: str
+    region: tuple
+    score: float
+    center: tuple
+    hit: bool
+
+    def __bool__(self):
+        return self.hit
+
 
 class Vision:
     def __init__(self):
         print("Initializing Vision (Lazy)...")
-        # self.sct is removed to ensure thread safety by creating a new instance per capture
+        # Live desktop by default; replay backends can be swapped in with set_backend()
+        self.backend = MssBackend()
         self.templates = {}
+        # Compiled 0-9 grayscale templates, in digit order (None where missing)
+        self.digit_templates = []
+        self.digit_recognizer = None
         self._loaded = False
+        # Per-thread preallocated cvtColor / matchTemplate destinations
+        self._local = threading.local()
+        # Last verdicts for pixel-identical crops (bait counter, static prompt icons)
+        self.crop_cache = CropCache()
+        # Reuses verdicts for regions that only changed by noise since the last match
+        self.change_gate = ChangeGate()
+        # (template name, region) -> screen position of the last tracked hit
+        self._tracks = {}
+        # Coarse-to-fine matching for large images; (name, factor) -> (image, mask)
+        self.use_pyramid = True
+        self._coarse_templates = {}
+        # Dot-product scoring for tiny regions; template name -> PresenceMatcher
+        self.use_presence = True
+        self._presence = {}
+        # Optional pool for find_templates(), see set_match_threads()
+        self.executor = None
+        # Rolling score / hit-rate / latency statistics per detector
+        self.telemetry = MatchTelemetry()
         # self.load_templates() # Moved to lazy load
         # print(f"Vision initialized. Loaded {len(self.templates)} templates.")
 
@@ -21,53 +152,172 @@ class Vision:
             self._loaded = True
             print(f"Vision templates loaded. Count: {len(self.templates)}")
 
-    def load_templates(self):
-        print("Loading templates from disk...")
-        resources_path = cfg._get_base_path() / 'resources'
-            
-        for filename in os.listdir(resources_path):
-            if filename.endswith('.png'):
-                # Load image with alpha channel, supporting Chinese characters in path
-                # img = cv2.imread(os.path.join(resources_path, filename), cv2.IMREAD_UNCHANGED)
-                file_path = os.path.join(resources_path, filename)
-                img = cv2.imdecode(np.fromfile(file_path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
-                if img is None:
-                    continue
+    def preload(self):
+        """
+        Loads the templates now instead of on the first detection.
+        Call after cfg.set_base_path(), before the worker threads start.
+        """
+        self._ensure_loaded()
+
+    def _decode_template(self, file_path):
+        """Decodes one PNG and resizes it to cfg.scale. Returns None on failure."""
+        try:
+            # Load image with alpha channel, supporting Chinese characters in path
+            img = cv2.imdecode(np.fromfile(file_path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        except OSError:
+            return None
+        if img is None:
+            return None
 
-                # Extract template name from filename
-                template_name = os.path.splitext(filename)[0]
+        # Resize image based on config scale
+        if cfg.scale != 1.0:
+            width = int(img.shape[1] * cfg.scale)
+            height = int(img.shape[0] * cfg.scale)
+            img = cv2.resize(img, (width, height), interpolation=cv2.INTER_AREA)
+        return img
 
-                # Resize image based on config scale
-                if cfg.scale != 1.0:
-                    width = int(img.shape[1] * cfg.scale)
-                    height = int(img.shape[0] * cfg.scale)
-                    img = cv2.resize(img, (width, height), interpolation=cv2.INTER_AREA)
+    def load_templates(self):
+        resources_path = cfg._get_base_path() / 'resources'
+        atlas = TemplateAtlas(cfg._get_base_path() / 'cache' / 'templates.atlas')
+        key = atlas.make_key(resources_path, TEMPLATE_NAMES, cfg.scale)
+
+        images = atlas.load(key)
+        if images is None:
+            print("Template atlas missing or stale, loading templates from disk...")
+            images = {}
+            for name in TEMPLATE_NAMES:
+                img = self._decode_template(resources_path / f'{name}.png')
+                if img is not None:
+                    images[name] = img
+            atlas.save(key, images)
+
+        for name, img in images.items():
+            self.templates[name] = Template.compile(name, img)
+        # Cached verdicts refer to the previous templates
+        self.crop_cache.clear()
+        self.change_gate.clear()
+        self._tracks.clear()
+        self._coarse_templates.clear()
+        self._presence.clear()
+
+        self.digit_templates = [self.templates.get(f'{i}_grayscale') for i in range(10)]
+        if any(t is not None for t in self.digit_templates):
+            self.digit_recognizer = DigitRecognizer([t.image if t is not None else None for t in self.digit_templates])
+
+    def set_backend(self, backend):
+        """Switches the capture source (see src.capture), e.g. to replay a recorded session."""
+        old_backend = self.backend
+        self.backend = backend
+        if old_backend is not backend:
+            old_backend.close()
+        self._tracks.clear()
+
+    def set_match_threads(self, threads):
+        """
+        Lets find_templates() match independent regions on `threads` worker
+        threads (cv2 releases the GIL while matching). 0 or 1 matches serially.
+        """
+        old_executor = self.executor
+        self.executor = None
+        if threads and threads > 1:
+            self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="vision-match")
+        if old_executor is not None:
+            old_executor.shutdown(wait=False)
+
+    def grab(self, region=None):
+        """
+        Raw BGRA pixels of `region` (primary monitor if None) from the active backend.
+        Backends wrap their capture buffer without copying, so treat it as read-only.
+        """
+        return self.backend.grab(region)
 
-                self.templates[template_name] = img
+    def grab_frame(self, region=None):
+        """Captures `region` (primary monitor if None) into a timestamped Frame."""
+        image = self.grab(region)
+        if region is None:
+            region = (0, 0, image.shape[1], image.shape[0])
+        return Frame(image, region, time.time())
 
     def screenshot(self, region=None):
-        with mss.mss() as sct:
-            if region is None:
-                # Use the primary monitor
-                monitor = sct.monitors[1]
-            else:
-                monitor = {'left': region[0], 'top': region[1], 'width': region[2], 'height': region[3]}
+        # Convert BGRA to BGR (a new array the caller may modify)
+        return cv2.cvtColor(self.grab(region), cv2.COLOR_BGRA2BGR)
 
-            # Grab the data
-            sct_img = sct.grab(monitor)
+    def _get_region_image(self, region, frame=None):
+        """
+        Returns the BGRA pixels of `region`: a view into `frame` when it covers
+        the region (see src.frame_bus), otherwise a fresh capture.
+        """
+        if frame is not None and frame.contains(region):
+            return frame.view(region)
+        return self.grab(region)
 
-            # Convert to a numpy array
-            img = np.array(sct_img)
+    def _buffer(self, key, shape, dtype=np.uint8):
+        """
+        Returns the calling thread's preallocated array for `key`, allocating
+        only on first use or when the shape changes.
+        """
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None:
+            buffers = self._local.buffers = {}
+        buf = buffers.get(key)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype)
+            buffers[key] = buf
+        return buf
+
+    def _convert(self, img, code, region, channels=1):
+        """cvtColor into the per-region destination buffer."""
+        shape = img.shape[:2] if channels == 1 else img.shape[:2] + (channels,)
+        return cv2.cvtColor(img, code, dst=self._buffer((code, region), shape))
+
+    def _match(self, img, template, method, mask=None):
+        """
+        matchTemplate (template is a Template.image array) into a result
+        buffer reused for every match of the same size.
+        """
+        shape = (img.shape[0] - template.shape[0] + 1, img.shape[1] - template.shape[1] + 1)
+        result = self._buffer(('match',) + shape, shape, np.float32)
+        return cv2.matchTemplate(img, template, method, result=result, mask=mask)
 
-            # Convert BGRA to BGR
-            return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+    def get_bait_amount(self, region=None, threshold=0.7, frame=None):
+        """Returns the bait count (int) or None if it can't be read."""
+        return self.read_bait_count(region, threshold, frame).value
+
+    def read_bait_count(self, region=None, threshold=0.7, frame=None):
+        """
+        Reads the bait counter. Returns a DigitReading whose confidence is the
+        weakest digit score that went into the value.
+        """
+        self._ensure_loaded()
+        if self.digit_recognizer is None:
+            return DigitReading(None, 0.0)
 
-    def get_bait_amount(self, region=None, threshold=0.7):
         if region is None:
             region = cfg.get_rect('bait_count')
         
         # print(f"DEBUG: Screenshotting for bait amount at region {region}")
-        screenshot = self.screenshot(region)
+        image = self._get_region_image(region, frame)
+        # 只转换一次灰度，十位/个位切片都是它的视图
+        gray = self._convert(image, cv2.COLOR_BGRA2GRAY, region)
+
+        # 画面几乎没变化时直接沿用上次的识别结果
+        gate_key = ('bait', region, threshold)
+        reading = self.change_gate.check(gate_key, gray)
+        if reading is not ChangeGate.MISSING:
+            return reading
+
+        start = time.perf_counter()
+        key = ('bait', region, threshold, fingerprint(gray))
+        reading = self.crop_cache.get(key)
+        if reading is CropCache.MISSING:
+            reading = self._read_digits(gray, threshold)
+            self.crop_cache.put(key, reading)
+        self.change_gate.update(gate_key, gray, reading, time.perf_counter() - start)
+        return reading
+
+    def _read_digits(self, gray, threshold):
+        """Splits the grayscale bait counter into tens/ones cells and recognises them."""
+        recognizer = self.digit_recognizer
         
         # 用户逻辑：切片宽度 BAIT_CROP_WIDTH1_BASE (15)
         # 假设 region 是两个数字的宽度，我们主要想识别个位数和十位数
@@ -81,108 +331,35 @@ class Vision:
         # 或者这是一个滚动计数器？
         # 让我们实现一个特定的切分识别逻辑。
         
-        h, w = screenshot.shape[:2]
+        h, w = gray.shape[:2]
         crop_width = int(cfg.BAIT_CROP_WIDTH1_BASE * cfg.scale)
         
         # 确保截图够宽
         if w < crop_width:
              # 如果不够宽，直接识别整个
-             return self._detect_digits(screenshot, threshold)
+             return recognizer.segment(gray, threshold)
 
         # 尝试切分为左右两部分 (假设最大两位数)
         # 右侧对齐切片 (个位)
-        right_part = screenshot[:, w-crop_width:w]
+        right_part = gray[:, w-crop_width:w]
         # 左侧剩余部分 (十位)
-        left_part = screenshot[:, 0:w-crop_width]
+        left_part = gray[:, 0:w-crop_width]
         
         # 识别右侧 (个位)
-        digit_ones = self._detect_single_digit(right_part, threshold)
+        digit_ones = recognizer.classify(right_part, threshold)
         
         # 识别左侧 (十位) - 可能为空
-        digit_tens = self._detect_single_digit(left_part, threshold)
+        digit_tens = recognizer.classify(left_part, threshold)
         
-        if digit_ones is not None:
-            if digit_tens is not None:
-                return digit_tens * 10 + digit_ones
+        if digit_ones.value is not None:
+            if digit_tens.value is not None:
+                return DigitReading(digit_tens.value * 10 + digit_ones.value,
+                                    min(digit_tens.confidence, digit_ones.confidence))
             else:
                 return digit_ones
         
         # 如果切分识别失败，回退到全图识别
-        return self._detect_digits(screenshot, threshold)
-
-    def _detect_single_digit(self, img, threshold):
-        """
-        Detects the single best matching digit in a small image crop.
-        Returns the digit (int) or None.
-        """
-        self._ensure_loaded()
-        gray_img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        best_match = -1
-        max_score = -1
-        
-        for i in range(10):
-            template_name = f'{i}_grayscale'
-            template = self.templates.get(template_name)
-            if template is None:
-                continue
-                
-            # Resize template if it's larger than the image crop
-            t_h, t_w = template.shape[:2]
-            i_h, i_w = gray_img.shape[:2]
-            
-            if t_h > i_h or t_w > i_w:
-                 # Skip if template is bigger than crop (shouldn't happen if config is right)
-                 continue
-
-            res = cv2.matchTemplate(gray_img, template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
-            
-            if max_val > max_score:
-                max_score = max_val
-                best_match = i
-        
-        if max_score >= threshold:
-            return best_match
-        
-        return None
-
-    def _detect_digits(self, img, threshold):
-        """
-        Helper method to detect digits in a given image (BGR).
-        """
-        self._ensure_loaded()
-        gray_screenshot = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        found_digits = []
-        for i in range(10):
-            template_name = f'{i}_grayscale'
-            template = self.templates.get(template_name)
-            if template is None:
-                continue
-
-            res = cv2.matchTemplate(gray_screenshot, template, cv2.TM_CCOEFF_NORMED)
-            loc = np.where(res >= threshold)
-            for pt in zip(*loc[::-1]):
-                found_digits.append({'digit': i, 'x': pt[0]})
-
-        if not found_digits:
-            return None
-        
-        found_digits.sort(key=lambda d: d['x'])
-
-        # Filter out overlapping detections
-        unique_digits = []
-        if found_digits:
-            unique_digits.append(found_digits[0])
-            for i in range(1, len(found_digits)):
-                # If the x-coordinate is far enough from the last one, it's a new digit
-                if found_digits[i]['x'] > unique_digits[-1]['x'] + 5: # 5px horizontal threshold
-                    unique_digits.append(found_digits[i])
-
-        try:
-            number_str = "".join([str(d['digit']) for d in unique_digits])
-            return int(number_str)
-        except (ValueError, TypeError):
-            return None
+        return recognizer.segment(gray, threshold)
 
     def wait_for_bait_change(self, timeout=30):
         """
@@ -204,42 +381,276 @@ class Vision:
         print("Timeout waiting for bait change.")
         return False
 
-    def find_template(self, template_name, region=None, threshold=0.8):
+    def get_template(self, template_name):
+        """
+        Returns the compiled template, decoding assets outside TEMPLATE_NAMES
+        from resources/ on first use.
+        """
         self._ensure_loaded()
-        screenshot = self.screenshot(region)
         template = self.templates.get(template_name)
-
         if template is None:
-            raise ValueError(f"Template '{template_name}' not found.")
-
-        # Handle alpha channel and dimensionality
-        if len(template.shape) == 3:
-            if template.shape[2] == 4:
-                # Separate the alpha channel as a mask
-                mask = template[:,:,3]
-                template = template[:,:,:3]
-                # Use the mask in template matching
-                result = cv2.matchTemplate(screenshot, template, cv2.TM_CCORR_NORMED, mask=mask)
-            else:
-                # BGR Template
-                result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+            img = self._decode_template(cfg._get_base_path() / 'resources' / f'{template_name}.png')
+            if img is None:
+                raise ValueError(f"Template '{template_name}' not found.")
+            template = Template.compile(template_name, img)
+            self.templates[template_name] = template
+        return template
+
+    def _match_template(self, template, image, region, threshold, crop_hash=None):
+        """
+        Matches a compiled template against an already converted region image,
+        reusing the previous result when the crop hasn't changed (or, for
+        searches not much larger than the template, hasn't visibly changed).
+        """
+        gated = template.width * template.height >= GATE_MIN_COVERAGE * image.shape[0] * image.shape[1]
+        gate_key = ('match', template.name, region, threshold)
+        if gated:
+            match = self.change_gate.check(gate_key, image)
+            if match is not ChangeGate.MISSING:
+                return match
+
+        start = time.perf_counter()
+        if crop_hash is None:
+            crop_hash = fingerprint(image)
+        key = ('match', template.name, region, threshold, image.shape, crop_hash)
+        match = self.crop_cache.get(key)
+        if match is CropCache.MISSING:
+            match = self._compute_match(template, image, region, threshold)
+            self.crop_cache.put(key, match)
+        if gated:
+            self.change_gate.update(gate_key, image, match, time.perf_counter() - start)
+        return match
+
+    def _compute_match(self, template, image, region, threshold):
+        presence = self._presence_matcher(template, image)
+        factor = 1 if presence is not None else self._pyramid_factor(template, image)
+        if presence is not None:
+            max_val, max_loc = presence.best(image)
+        elif factor > 1:
+            max_val, max_loc = self._match_pyramid(template, image, region, factor)
         else:
-            # Grayscale Template - convert screenshot to grayscale for matching
-            gray_screenshot = cv2.cvtColor(screenshot, cv2.COLOR_BGR2GRAY)
-            result = cv2.matchTemplate(gray_screenshot, template, cv2.TM_CCOEFF_NORMED)
-
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-
-        if max_val >= threshold:
-            # Get the center of the found template
-            template_w = template.shape[1]
-            template_h = template.shape[0]
-            center_x = max_loc[0] + template_w // 2
-            center_y = max_loc[1] + template_h // 2
-            return (center_x, center_y)
+            result = self._match(image, template.image, template.method, mask=template.mask)
+            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        # Get the center of the best match
+        center = (max_loc[0] + template.center[0], max_loc[1] + template.center[1])
+        return MatchResult(template.name, region, max_val, center, max_val >= threshold)
+
+    def _presence_matcher(self, template, image):
+        """PresenceMatcher for a tiny grayscale search, or None to use cv2.matchTemplate."""
+        if not self.use_presence or template.channels != 1 or template.method != cv2.TM_CCOEFF_NORMED:
+            return None
+        matcher = self._presence.get(template.name)
+        if matcher is None:
+            matcher = self._presence[template.name] = PresenceMatcher(template.image)
+        if not 0 < matcher.offsets(image.shape) <= PRESENCE_MAX_OFFSETS:
+            return None
+        return matcher
+
+    def _pyramid_factor(self, template, image):
+        """Downscale factor for coarse-to-fine matching, 1 to match at full resolution."""
+        if not self.use_pyramid or image.shape[0] * image.shape[1] < PYRAMID_MIN_AREA:
+            return 1
+        return min(PYRAMID_MAX_FACTOR, min(template.width, template.height) // PYRAMID_MIN_TEMPLATE_SIDE)
+
+    def _coarse_template(self, template, factor):
+        key = (template.name, factor)
+        coarse = self._coarse_templates.get(key)
+        if coarse is None:
+            size = (template.width // factor, template.height // factor)
+            image = cv2.resize(template.image, size, interpolation=cv2.INTER_AREA)
+            mask = None
+            if template.mask is not None:
+                mask = cv2.resize(template.mask, size, interpolation=cv2.INTER_NEAREST)
+            coarse = self._coarse_templates[key] = (image, mask)
+        return coarse
+
+    def _match_pyramid(self, template, image, region, factor):
+        """
+        Matches a downscaled template against a downscaled image, then
+        re-scores the best few coarse peaks at full resolution. Returns
+        (score, location) like minMaxLoc on the full-resolution result, so
+        thresholds keep their meaning.
+        """
+        height, width = image.shape[:2]
+        small_shape = (height // factor, width // factor) + image.shape[2:]
+        small = self._buffer(('pyramid', region, factor), small_shape, image.dtype)
+        cv2.resize(image, (small_shape[1], small_shape[0]), dst=small, interpolation=cv2.INTER_AREA)
+        coarse_image, coarse_mask = self._coarse_template(template, factor)
+        result = self._match(small, coarse_image, template.method, mask=coarse_mask)
+
+        # Search a few coarse pixels around each peak to absorb rounding
+        pad = 2 * factor
+        half_w, half_h = coarse_image.shape[1] // 2, coarse_image.shape[0] // 2
+        best_val, best_loc = -1.0, (0, 0)
+        for _ in range(PYRAMID_CANDIDATES):
+            _, peak_val, _, (cx, cy) = cv2.minMaxLoc(result)
+            if peak_val < -1.0:
+                break
+            # Suppress this peak so the next candidate is a different location
+            result[max(0, cy - half_h):cy + half_h + 1, max(0, cx - half_w):cx + half_w + 1] = -2.0
+
+            left = max(0, min(cx * factor - pad, width - template.width))
+            top = max(0, min(cy * factor - pad, height - template.height))
+            right = min(width, left + template.width + 2 * pad)
+            bottom = min(height, top + template.height + 2 * pad)
+            window = image[top:bottom, left:right]
+            refined = self._match(window, template.image, template.method, mask=template.mask)
+            _, val, _, (x, y) = cv2.minMaxLoc(refined)
+            if val > best_val:
+                best_val, best_loc = val, (left + x, top + y)
+        return best_val, best_loc
+
+    def _track_window(self, template, region):
+        """
+        Returns (window, offset) for a tracked template: the screen rectangle
+        around its last hit and the window's offset inside `region`. None when
+        the template isn't tracked or the window wouldn't be smaller.
+        """
+        origin = self._tracks.get((template.name, region))
+        if origin is None:
+            return None
+        rx, ry, rw, rh = region if region is not None else (0, 0, cfg.screen_width, cfg.screen_height)
+        margin = max(2, int(TRACK_MARGIN_BASE * cfg.scale))
+        left = max(rx, origin[0] - margin)
+        top = max(ry, origin[1] - margin)
+        right = min(rx + rw, origin[0] + template.width + margin)
+        bottom = min(ry + rh, origin[1] + template.height + margin)
+        if right - left < template.width or bottom - top < template.height:
+            return None
+        if (right - left) * (bottom - top) >= rw * rh:
+            return None
+        return (left, top, right - left, bottom - top), (left - rx, top - ry)
+
+    def _match_tracked(self, template, region, threshold, frame):
+        """
+        Searches only the window around the template's last hit. Returns a
+        MatchResult relative to `region` on a hit; on a miss the track is
+        dropped and None is returned so the caller searches the whole region.
+        """
+        tracked = self._track_window(template, region)
+        if tracked is None:
+            return None
+        window, (dx, dy) = tracked
+        image = self._get_region_image(window, frame)
+        image = self._convert(image, template.color_code, window, template.channels)
+        match = self._match_template(template, image, window, threshold)
+        if not match.hit:
+            self._tracks.pop((template.name, region), None)
+            return None
+        center = (match.center[0] + dx, match.center[1] + dy)
+        return MatchResult(template.name, region, match.score, center, True)
+
+    def _update_track(self, template, region, match):
+        """Starts tracking from a full-region hit, or stops after a miss."""
+        key = (template.name, region)
+        if not match.hit:
+            self._tracks.pop(key, None)
+            return
+        rx, ry = region[:2] if region is not None else (0, 0)
+        self._tracks[key] = (rx + match.center[0] - template.center[0], ry + match.center[1] - template.center[1])
+
+    def find_template(self, template_name, region=None, threshold=0.8, frame=None, track=False):
+        """
+        Returns the center of the best match (relative to `region`) or None.
+
+        With `track=True` a hit is remembered and later calls only search a
+        small window around it, widening back to the whole region after a miss.
+        """
+        template = self.get_template(template_name)
+        start = time.perf_counter()
+
+        match = self._match_tracked(template, region, threshold, frame) if track else None
+        if match is None:
+            # BGRA pixels, converted straight into the template's color space
+            image = self._get_region_image(region, frame)
+            image = self._convert(image, template.color_code, region, template.channels)
+            match = self._match_template(template, image, region, threshold)
+            if track:
+                self._update_track(template, region, match)
+        self.telemetry.record(template_name, match.score, match.hit, time.perf_counter() - start, threshold)
+
+        if match.hit:
+            return match.center
         
         return None
 
+    def find_templates(self, queries, frame=None, track=False):
+        """
+        Answers several (template_name, region, threshold) queries at once.
+
+        Captures once (the bounding box of all regions, unless `frame` already
+        covers them), converts each region to each needed color space once and
+        returns one MatchResult per query, in order. `track` works as in
+        find_template.
+
+        With a match pool (set_match_threads) and enough pixels to search,
+        regions (and the templates of large regions) are matched in parallel.
+        """
+        compiled = [(self.get_template(name), region, threshold) for name, region, threshold in queries]
+        regions = [region for _, region, _ in compiled]
+
+        if frame is None or not all(frame.contains(region) for region in regions):
+            if any(region is None for region in regions):
+                frame = self.grab_frame(None)
+            else:
+                frame = self.grab_frame(bounding_box(regions))
+
+        # Queries on the same region and color space share one conversion
+        groups = {}
+        for index, (template, region, threshold) in enumerate(compiled):
+            groups.setdefault((template.color_code, region), []).append((index, template, threshold))
+
+        results = [None] * len(compiled)
+        executor = self.executor
+        if executor is None or len(compiled) < 2 or self._search_pixels(groups) < PARALLEL_MIN_PIXELS:
+            for (_, region), members in groups.items():
+                for index, match in self._answer_group(region, members, frame, track):
+                    results[index] = match
+            return results
+
+        futures = []
+        for (_, region), members in groups.items():
+            if len(members) > 1 and self._region_pixels(region) >= PARALLEL_MIN_PIXELS:
+                # Convert once here, then match each template on its own thread
+                template = members[0][1]
+                image = self._convert(frame.view(region), template.color_code, region, template.channels)
+                crop_hash = fingerprint(image)
+                futures += [executor.submit(self._answer_group, region, [member], frame, track, image, crop_hash)
+                            for member in members]
+            else:
+                futures.append(executor.submit(self._answer_group, region, members, frame, track))
+        for future in futures:
+            for index, match in future.result():
+                results[index] = match
+        return results
+
+    def _region_pixels(self, region):
+        return cfg.screen_width * cfg.screen_height if region is None else region[2] * region[3]
+
+    def _search_pixels(self, groups):
+        return sum(self._region_pixels(region) for _, region in groups)
+
+    def _answer_group(self, region, members, frame, track, image=None, crop_hash=None):
+        """
+        Matches [(index, template, threshold)] that share a region and color
+        space. `image` is the region already converted, if the caller did so.
+        """
+        answers = []
+        for index, template, threshold in members:
+            if track:
+                match = self._match_tracked(template, region, threshold, frame)
+                if match is not None:
+                    answers.append((index, match))
+                    continue
+            if image is None:
+                image = self._convert(frame.view(region), template.color_code, region, template.channels)
+                crop_hash = fingerprint(image)
+            match = self._match_template(template, image, region, threshold, crop_hash)
+            if track:
+                self._update_track(template, region, match)
+            answers.append((index, match))
+        return answers
+
     def draw_debug_rects(self, image, config):
         """
         Draw debug rectangles with Chinese labels and a legend on the image.
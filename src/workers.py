@@ -1,15 +1,33 @@
 import cv2
-import re
 import time
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import mss
 from PySide6.QtCore import QThread, Signal, Slot
-from rapidocr_onnxruntime import RapidOCR
 from src.vision import vision
-from src.inputs import InputController
+from src.frame_bus import frame_bus
+from src.detectors import planner
+from src.bait_filter import BaitCountFilter
+from src.ocr_engine import ocr_engine
+from src.catch_parser import parse_catch_text
+from src.region_cache import RecentCrops
+from src import layout
 from src.config import cfg
 
+# 已提交后台识别、尚无结果的渔获卡片
+PENDING_CATCH = object()
+
+
+def _input_controller():
+    """
+    真实的鼠标键盘控制器. pynput 在导入时就需要桌面环境 (如 X display),
+    因此延迟到真正需要时才导入, 无桌面的回放不受影响.
+    """
+    from src.inputs import InputController
+    return InputController()
+
+
 class FishingWorker(QThread):
     """
     自动化钓鱼逻辑的核心线程
@@ -18,13 +36,32 @@ class FishingWorker(QThread):
     status_updated = Signal(str)
     record_added = Signal(dict)
 
-    def __init__(self):
+    def __init__(self, inputs=None):
         super().__init__()
-        self.ocr = RapidOCR()
+        # OCR 模型在后台线程加载并预热, 不阻塞界面启动
+        self.ocr_engine = ocr_engine
+        self.ocr_engine.start()
+        # 渔获识别在单独线程中按顺序进行, 不阻塞下一轮抛竿
+        self._ocr_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catch-ocr")
+        self._records_lock = threading.Lock()
+        # 最近识别过的渔获卡片: 弹窗未关闭时再次截到同一张卡片不重复识别/记录
+        self.ocr_cache = RecentCrops(ttl=cfg.global_settings.get("ocr_cache_ttl", 15.0))
+        self.duplicate_catches = 0
         self.running = False
         self.paused = True  # Start in a paused state
-        self.inputs = InputController()
+        # 回放等无桌面场景可传入替代的输入后端
+        self.inputs = inputs if inputs is not None else _input_controller()
         self.vision = vision
+        # 启动时映射模板图集，避免第一次抛竿检测时才解码模板
+        self.vision.preload()
+        # 可选: 多线程并行匹配多个区域 (match_threads <= 1 时串行)
+        self.vision.set_match_threads(cfg.global_settings.get("match_threads", 0))
+        self.frame_bus = frame_bus
+        # 各状态的检测项由 cfg.DETECTORS / cfg.DETECTOR_PLANS 声明
+        self.planner = planner
+        # 鱼饵数量投票: 单帧误读 (如 8 读成 6) 不会触发收杆
+        self.bait_filter = BaitCountFilter(cfg.global_settings.get("bait_votes", 2),
+                                           cfg.global_settings.get("bait_vote_window", 3))
         self.state = "finding_prompt"  # 初始状态
         # 确保截图目录存在
         screenshots_dir = cfg._get_base_path() / 'screenshots'
@@ -42,16 +79,18 @@ class FishingWorker(QThread):
         self.log_updated.emit("正在执行启动环境预检...")
         env_checked = False
         
-        # 1. 检查抛竿提示
-        for key in ['F1_grayscale', 'F2_grayscale']:
-            if self.vision.find_template(key, threshold=0.8):
-                env_checked = True
-                break
-        
-        # 3. 检查鱼饵数量
-        if not env_checked:
-            if self.vision.get_bait_amount() is not None:
-                env_checked = True
+        # 检查抛竿提示或鱼饵数量 (整屏只截一次, 一次完成全部检测)
+        detections = self.planner.run("precheck")
+        env_checked = any(detections.values())
+        if not env_checked and cfg.layout_key() not in cfg.layout_profiles:
+            # 当前分辨率尚未校准: 界面缩放或位置可能与默认假设不符
+            if cfg.global_settings.get("auto_calibrate_layout", False):
+                env_checked = self._calibrate_layout()
+            else:
+                self.log_updated.emit(
+                    f"提示: 分辨率 {cfg.layout_key()} 尚未校准, 可在出现 F1/F2 提示时运行 "
+                    "python -m tools.calibrate_layout --write, 或开启 auto_calibrate_layout 自动校准。"
+                )
 
         if env_checked:
              self.log_updated.emit("环境检查通过，开始运行。")
@@ -95,6 +134,7 @@ class FishingWorker(QThread):
                         self.smart_sleep(1.0)
                     # 无论成功与否，都重置到初始状态
                     self.state = "finding_prompt"
+                    self._log_gate_stats()
 
             except Exception as e:
                 self.log_updated.emit(f"发生错误: {e}")
@@ -104,8 +144,79 @@ class FishingWorker(QThread):
             # 循环间隔，等待指定时间后再进行下一轮
             self.smart_sleep(cfg.cycle_interval) 
 
+        self._log_gate_stats()
         self.log_updated.emit("自动化钓鱼已停止。")
 
+    def _calibrate_layout(self):
+        """
+        在整屏截图中多尺度搜索 F1/F2 提示图标, 推算实际界面缩放与偏移。
+        只有按校准结果在锚点区域内重新检测到提示时才按分辨率保存到 config.json, 否则恢复默认布局,
+        避免游戏不在前台等单帧异常把错误的偏移写入磁盘。成功返回 True
+        """
+        self.log_updated.emit("正在自动校准界面布局...")
+        start = time.perf_counter()
+        profile = None
+        try:
+            profile = layout.calibrate(self.frame_bus.tick_screen().image)
+            if profile is None:
+                self.log_updated.emit("自动校准失败: 未找到抛竿提示, 请在出现 F1/F2 提示时重试。")
+                return False
+            # 先只在内存中应用, 模板按校准后的缩放重新预缩放一次;
+            # 整屏预检与布局无关, 须由锚点区域内的检测项确认提示确实落在区域中
+            layout.apply_profile(profile, save=False)
+            self._reload_layout()
+            anchors = [name for name, d in cfg.DETECTORS.items() if d.get("region") in layout.ANCHOR_REGIONS]
+            verified = any(self.planner.run_detectors(anchors, track=False).values())
+        except Exception as e:
+            self.log_updated.emit(f"自动校准出错: {e}")
+            if profile is not None:
+                self._discard_layout(profile)
+            return False
+
+        if not verified:
+            self._discard_layout(profile)
+            self.log_updated.emit(
+                f"自动校准结果未通过区域检测, 已放弃 (缩放 {profile.scale:.3f}, "
+                f"偏移 ({profile.offset_x}, {profile.offset_y}), 匹配度 {profile.score:.2f})。"
+            )
+            return False
+
+        cfg.save()
+        self.log_updated.emit(
+            f"界面布局已校准并保存到 config.json ({profile.key}): 缩放 {profile.scale:.3f}, "
+            f"偏移 ({profile.offset_x}, {profile.offset_y}), 匹配度 {profile.score:.2f}, "
+            f"锚点 {profile.anchors} 个, 耗时 {time.perf_counter() - start:.1f} 秒"
+        )
+        return True
+
+    def _discard_layout(self, profile):
+        """撤销未保存的校准结果, 恢复当前分辨率的默认布局"""
+        cfg.layout_profiles.pop(profile.key, None)
+        cfg.set_screen_size(cfg.screen_width, cfg.screen_height)
+        self._reload_layout()
+
+    def _reload_layout(self):
+        """布局变化后重新预缩放模板并重新编译检测计划"""
+        self.vision.load_templates()
+        self.planner.invalidate()
+
+    def _log_gate_stats(self):
+        """
+        调试日志: 变化检测跳过的识别次数及节省的时间, OCR 缓存命中与重复渔获
+        """
+        stats = self.vision.change_gate.stats()
+        if stats['checks']:
+            self.log_updated.emit(
+                f"[调试] 变化检测: 跳过 {stats['skips']}/{stats['checks']} 次识别 "
+                f"({stats['skip_ratio']:.0%}), 节省约 {stats['time_saved'] * 1000:.1f} ms"
+            )
+        ocr_stats = self.ocr_cache.stats()
+        if ocr_stats['hits']:
+            self.log_updated.emit(
+                f"[调试] OCR 缓存: 命中 {ocr_stats['hits']}/{ocr_stats['hits'] + ocr_stats['misses']} 次, "
+                f"拦截重复渔获 {self.duplicate_catches} 条"
+            )
+
     def _cast_rod(self):
         """
         抛竿阶段
@@ -116,53 +227,48 @@ class FishingWorker(QThread):
 
         start_time = time.time()
         timeout = 10
-        cast_rod_region = cfg.get_rect("cast_rod")
-        cast_rod_ice_region = cfg.get_rect("cast_rod_ice")
 
         while time.time() - start_time < timeout:
              if not self.running: return False
              while self.paused: self.msleep(100)
 
-             for key in ['F1_grayscale', 'F2_grayscale']:
-                  # 同时检测原有的区域和新的冰钓区域
-                  found_region = None
-                  if self.vision.find_template(key, region=cast_rod_region, threshold=0.8):
-                      found_region = cast_rod_region
-                  elif self.vision.find_template(key, region=cast_rod_ice_region, threshold=0.8):
-                      found_region = cast_rod_ice_region
-
-                  if found_region:
-                      self.log_updated.emit(f"检测到抛竿提示, 准备抛竿。")
-                      self.inputs.hold_mouse(cfg.cast_time)
-                      
-                      # -- 状态转换验证 --
-                      self.smart_sleep(1.0) # 等待UI响应
-                      
-                      verification_start_time = time.time()
-                      verification_timeout = 5 # 5秒验证超时
-                      wait_bite_region = cfg.get_rect("wait_bite")
-                      
-                      while time.time() - verification_start_time < verification_timeout:
-                          # 成功条件: 抛竿区图标消失 AND 等待区图标出现
-                          cast_icon_gone = not self.vision.find_template(key, region=found_region, threshold=0.8)
-                          wait_icon_appeared = self.vision.find_template(key, region=wait_bite_region, threshold=0.8)
-
-                          if cast_icon_gone and wait_icon_appeared:
-                              self.log_updated.emit("已抛竿, 进入等待咬钩状态。")
-                              return True # 抛竿成功
-                          
-                          self.msleep(200)
-
-                      # 如果超时，说明抛竿失败
-                      bait_amount = self.vision.get_bait_amount()
-                      if bait_amount == 0:
-                          self.log_updated.emit("错误：抛竿后状态未改变，且鱼饵数量为0。")
-                          self.pause(reason="没有鱼饵了")
-                      else:
-                          self.log_updated.emit("错误：抛竿后状态未改变，可能鱼桶已满。")
-                          self.pause(reason="鱼桶可能已满")
-                      return False
-                      # -- 验证结束 --
+             # 同时检测原有的区域和新的冰钓区域 (按 F1/F2 顺序), 共用同一帧
+             detections = self.planner.run("finding_prompt")
+             found_name = next((name for name, match in detections.items() if match.hit), None)
+
+             if found_name:
+                 self.log_updated.emit(f"检测到抛竿提示, 准备抛竿。")
+                 self.inputs.hold_mouse(cfg.cast_time)
+                 
+                 # -- 状态转换验证 --
+                 self.smart_sleep(1.0) # 等待UI响应
+                 
+                 verification_start_time = time.time()
+                 verification_timeout = 5 # 5秒验证超时
+                 # 同一按键的等待区检测项, 例如 cast_rod_ice_F1 -> wait_bite_F1
+                 wait_name = "wait_bite_" + found_name.rsplit("_", 1)[1]
+                 verify_names = [found_name, wait_name]
+                 
+                 while time.time() - verification_start_time < verification_timeout:
+                     # 成功条件: 抛竿区图标消失 AND 等待区图标出现
+                     detections = self.planner.run_detectors(verify_names, track=False)
+
+                     if not detections[found_name].hit and detections[wait_name].hit:
+                         self.log_updated.emit("已抛竿, 进入等待咬钩状态。")
+                         return True # 抛竿成功
+                     
+                     self.msleep(200)
+
+                 # 如果超时，说明抛竿失败
+                 bait_amount = self.planner.run("waiting_for_bite")["bait_count"].value
+                 if bait_amount == 0:
+                     self.log_updated.emit("错误：抛竿后状态未改变，且鱼饵数量为0。")
+                     self.pause(reason="没有鱼饵了")
+                 else:
+                     self.log_updated.emit("错误：抛竿后状态未改变，可能鱼桶已满。")
+                     self.pause(reason="鱼桶可能已满")
+                 return False
+                 # -- 验证结束 --
 
              self.msleep(200)
 
@@ -181,16 +287,17 @@ class FishingWorker(QThread):
         # 增加初始检查: 如果根本获取不到鱼饵数量，说明可能没抛竿或界面不对
         initial_check_retries = 3
         initial_bait = None
+        self.bait_filter.reset()
 
-        # 在等待循环前，先获取一次初始鱼饵数量
-        for _ in range(initial_check_retries):
+        # 在等待循环前，先通过投票确认初始鱼饵数量
+        for _ in range(initial_check_retries * self.bait_filter.window):
             if not self.running: return False
             while self.paused: self.msleep(100)
             
-            initial_bait = self.vision.get_bait_amount()
+            initial_bait = self.bait_filter.update(self.planner.run("waiting_for_bite")["bait_count"])
             if initial_bait is not None:
                 break
-            self.smart_sleep(0.5)
+            self.msleep(200)
             
         if initial_bait is None:
             self.log_updated.emit("警告: 无法获取初始鱼饵数量，可能未抛竿或已收杆。重置循环。")
@@ -203,7 +310,8 @@ class FishingWorker(QThread):
             if not self.running or self.paused:
                 return False
 
-            current_bait = self.vision.get_bait_amount()
+            # 只有投票确认的数量减少才判定为咬钩
+            current_bait = self.bait_filter.update(self.planner.run("waiting_for_bite")["bait_count"])
             if current_bait is not None and current_bait < initial_bait:
                 self.log_updated.emit(f"检测到鱼饵数量变化 ({initial_bait} -> {current_bait}), 判定为咬钩。")
                 return True
@@ -223,8 +331,6 @@ class FishingWorker(QThread):
         if not self.running: return False
         self.status_updated.emit("上鱼了! 开始收杆!")
         self.log_updated.emit("进入收放线循环...")
-        
-        star_region = cfg.get_rect("reel_in_star")
 
         for i in range(cfg.max_pulls):
             if not self.running or self.paused:
@@ -258,19 +364,18 @@ class FishingWorker(QThread):
 
             # --- START: “鱼跑了”检测 ---
             # 在放线间隙，检查是否意外回到了抛竿状态
-            cast_rod_region = cfg.get_rect("cast_rod")
-            cast_rod_ice_region = cfg.get_rect("cast_rod_ice")
-            for key in ['F1_grayscale', 'F2_grayscale']:
-                if self.vision.find_template(key, region=cast_rod_region, threshold=0.8) or \
-                   self.vision.find_template(key, region=cast_rod_ice_region, threshold=0.8):
-                    self.log_updated.emit("在收线过程中检测到抛竿提示，判定为鱼跑了！")
-                    self.status_updated.emit("鱼跑了!")
-                    self._record_event("鱼跑了") # 记录事件
-                    return False # 返回False，主循环会继续下一次尝试
+            # 鱼跑了检测与星星检测共用同一帧, 一次完成全部匹配
+            detections = self.planner.run("reeling_in")
+            star_match = detections.pop("reel_in_star")
+            if any(detections.values()):
+                self.log_updated.emit("在收线过程中检测到抛竿提示，判定为鱼跑了！")
+                self.status_updated.emit("鱼跑了!")
+                self._record_event("鱼跑了") # 记录事件
+                return False # 返回False，主循环会继续下一次尝试
             # --- END: “鱼跑了”检测 ---
 
             # 检测是否成功钓到鱼
-            if self.vision.find_template('star_grayscale', region=star_region, threshold=0.7):
+            if star_match.hit:
                 self.log_updated.emit("检测到星星，成功！")
                 return True
 
@@ -280,133 +385,110 @@ class FishingWorker(QThread):
 
     def _record_catch(self):
         """
-        截图识别渔获信息, 并发送信号
+        截取渔获弹窗, 交给后台 OCR 线程识别后立即返回,
+        主循环随即关闭弹窗并开始下一轮, 识别结果稍后通过 record_added 发出
         """
         if not self.running: return False
         self.status_updated.emit("记录渔获")
-        self.log_updated.emit("正在识别渔获信息...")
+        self.log_updated.emit("正在截取渔获信息...")
 
         self.smart_sleep(1.0) # 等待UI稳定
 
         # 尝试检测并点击"收起"按钮 (shangyu)
-        shangyu_region = cfg.get_rect("shangyu")
-        if self.vision.find_template('shangyu_grayscale', region=shangyu_region, threshold=0.8):
+        if self.planner.run("catch", track=False)["shangyu"].hit:
              self.log_updated.emit("检测到'收起'按钮，确认上鱼成功。")
              # shangyu仅作为状态指示，不作为点击位置，稍后统一左键点击关闭
              # 注意：这里我们稍后点击，先截图OCR，防止点击后弹窗消失
-        
+
         rect = cfg.get_rect("ocr_area")
         if not rect:
             self.log_updated.emit("错误: 未在配置中找到 'ocr_area' 区域。")
             return False
 
-        image = self.vision.screenshot(rect)
-        if image is None:
+        # 整屏截一次: OCR 区域是它的视图, 传说品质时也用它保存截图 (弹窗此时已关闭)
+        frame = self.vision.grab_frame()
+        if frame is None:
             self.log_updated.emit("截图失败。")
             return False
 
-        result, _ = self.ocr(image)
-
-        if not result:
-            self.log_updated.emit("OCR未能识别到有效的渔获信息。")
-            try:
-                # Debug: save the failed image
-                debug_dir = cfg._get_base_path() / 'debug_screenshots'
-                if not debug_dir.exists():
-                    debug_dir.mkdir(parents=True)
-                timestamp = time.strftime("%Y%m%d_%H%M%S")
-                debug_filename = debug_dir / f"ocr_failed_{timestamp}.png"
-                cv2.imwrite(str(debug_filename), image)
-                self.log_updated.emit(f"OCR失败，已保存调试截图: {debug_filename}")
-            except Exception as e:
-                self.log_updated.emit(f"保存调试截图失败: {e}")
-            return False
-        
-        full_text = "".join([res[1] for res in result])
-        self.log_updated.emit(f"识别到原始文本: {full_text}")
-        
-        # 检测是否为新纪录
-        is_new_record = "新纪录" in full_text or "新记录" in full_text
-        if is_new_record:
-            self.log_updated.emit("检测到新纪录！")
-            # 移除关键词以免干扰后续解析
-            full_text = full_text.replace("新纪录", "").replace("新记录", "")
-        
-        # 增强容错：只要文本中包含关键字即可，不需要精确匹配
-        if "你钓到了" not in full_text:
-            # 尝试模糊匹配或查找后续特征，如"千克"
-            if "千克" in full_text:
-                self.log_updated.emit("未检测到'你钓到了'前缀，但发现重量单位，尝试继续解析。")
-                # 假设所有文本都是有效信息
+        signature, cached = self.ocr_cache.lookup(frame.view(rect))
+        if cached is not RecentCrops.MISSING:
+            if cached is None:
+                self.log_updated.emit("与刚才识别失败的卡片相同, 跳过识别。")
             else:
-                self.log_updated.emit("OCR结果不包含关键字，判定为钓鱼失败。")
-                return False
-
-        cleaned_text = full_text.replace(" ", "").replace("(", "").replace(")", "")
-
-        # 检测并清理新纪录关键词
-        # 已经在前一步做了初步检测，这里进行清理以防止干扰后续解析
-        new_record_keywords = ["新纪录", "新记录", "首次捕获", "首次"]
-        for kw in new_record_keywords:
-            if kw in cleaned_text:
-                is_new_record = True # 再次确认
-                cleaned_text = cleaned_text.replace(kw, "")
-
-        # 额外清理冒号，OCR识别“首次捕获”后常伴随冒号
-        cleaned_text = cleaned_text.replace(":", "").replace("：", "")
+                # 识别中 (PENDING) 或已识别的同一张卡片
+                self.duplicate_catches += 1
+                detail = "" if cached is PENDING_CATCH else f": {cached['name']} {cached['weight']}kg"
+                self.log_updated.emit(f"同一张渔获卡片已在记录中{detail}, 判定为重复, 不再记录。")
+            return True
+
+        self.ocr_cache.put(signature, PENDING_CATCH)
+        self._ocr_pool.submit(self._recognize_catch, frame, rect, signature)
+        return True
 
+    def _recognize_catch(self, frame, rect, signature):
+        """
+        (OCR 线程) 识别渔获信息, 发送 record_added 信号并写入记录文件
+        """
         try:
-            # 移除固定的前缀 "你钓到了" (如果存在)
-            if "你钓到了" in cleaned_text:
-                text_after_prefix = cleaned_text.split("你钓到了", 1)[-1]
-            else:
-                text_after_prefix = cleaned_text
-
-            # 定义所有可能的品质
-            # 包含繁体字和同义词
-            qualities = ['标准', '非凡', '稀有', '史诗', '传说', '传奇', '標準', '傳說', '傳奇']
-            
-            # 提取重量
-            weight = 0.0
-            weight_match = re.search(r"(\d+\.?\d*)千克", text_after_prefix)
-            if weight_match:
-                weight = float(weight_match.group(1))
-                # 从字符串中移除重量信息以便于解析鱼名和品质
-                text_after_prefix = text_after_prefix.replace(weight_match.group(0), "").strip()
-
-            # 提取品质
-            quality = "普通" # 默认值
-            for q in qualities:
-                if q in text_after_prefix:
-                    quality = q
-                    # 从字符串中移除品质信息
-                    text_after_prefix = text_after_prefix.replace(q, "").strip()
-                    break
-            
-            # 品质名称归一化
-            if quality in ['传奇', '傳奇', '傳說']:
-                quality = '传说'
-            elif quality == '標準':
-                quality = '标准'
-            
-            # 剩下的就是鱼名，移除任何特殊字符
-            fish_name = re.sub(r'[★☆]', '', text_after_prefix).strip()
-            # 后处理：移除鱼名末尾的数字
-            fish_name = re.sub(r'\d+$', '', fish_name)
-            
-            if not fish_name:
-                self.log_updated.emit(f"无法从 '{full_text}' 中解析出鱼名。")
-                return False
-
-            self.log_updated.emit(f"解析结果 -> 鱼名: '{fish_name}', 品质: '{quality}', 重量: {weight}")
+            image = cv2.cvtColor(frame.view(rect), cv2.COLOR_BGRA2BGR)
 
+            # 仅在后台预热尚未完成时才等待
+            if not self.ocr_engine.ready:
+                self.log_updated.emit("OCR 引擎仍在加载, 等待完成...")
+            wait_start = time.perf_counter()
+            try:
+                self.ocr_engine.get()
+            except Exception as e:
+                self.log_updated.emit(f"OCR 引擎加载失败: {e}")
+                return
+            ocr_start = time.perf_counter()
+            # 快速模式: 投影分行后只做识别, 置信度不足时自动回退到完整检测
+            result, mode = self.ocr_engine.read(image)
+            self.log_updated.emit(f"[调试] OCR ({mode}) 耗时 {time.perf_counter() - ocr_start:.2f} 秒 "
+                                  f"(等待引擎 {ocr_start - wait_start:.2f} 秒)")
+
+            if not result:
+                self.log_updated.emit("OCR未能识别到有效的渔获信息。")
+                self.ocr_cache.put(signature, None)
+                try:
+                    # Debug: save the failed image
+                    debug_dir = cfg._get_base_path() / 'debug_screenshots'
+                    if not debug_dir.exists():
+                        debug_dir.mkdir(parents=True)
+                    timestamp = time.strftime("%Y%m%d_%H%M%S")
+                    debug_filename = debug_dir / f"ocr_failed_{timestamp}.png"
+                    cv2.imwrite(str(debug_filename), image)
+                    self.log_updated.emit(f"OCR失败，已保存调试截图: {debug_filename}")
+                except Exception as e:
+                    self.log_updated.emit(f"保存调试截图失败: {e}")
+                return
+
+            full_text = "".join([res[1] for res in result])
+            self.log_updated.emit(f"识别到原始文本: {full_text}")
+
+            catch_data = parse_catch_text(full_text, self.log_updated.emit)
+            # 同一张卡片再次出现时直接沿用这次的解析结果
+            self.ocr_cache.put(signature, catch_data)
+            if catch_data is None:
+                return
+            self._save_catch(catch_data, frame)
         except Exception as e:
-            self.log_updated.emit(f"数据解析过程中发生错误: {e}")
-            return False
+            self.log_updated.emit(f"渔获识别过程中发生错误: {e}")
 
-        self.log_updated.emit(f"钓到鱼: {fish_name}, 重量: {weight}kg, 品质: {quality}")
+    def wait_for_catches(self, timeout=None):
+        """
+        等待已提交的渔获识别全部完成 (例如回放测试结束时)
+        """
+        self._ocr_pool.submit(lambda: None).result(timeout)
 
-        catch_data = {'name': fish_name, 'weight': weight, 'quality': quality, 'is_new_record': is_new_record}
+    def _save_catch(self, catch_data, frame):
+        """
+        (OCR 线程) 发送渔获信号, 写入 CSV, 传说品质时保存截图
+        """
+        fish_name, weight, quality = catch_data['name'], catch_data['weight'], catch_data['quality']
+        is_new_record = catch_data['is_new_record']
+        self.log_updated.emit(f"钓到鱼: {fish_name}, 重量: {weight}kg, 品质: {quality}")
         self.record_added.emit(catch_data)
 
         # Persistence: Write to CSV
@@ -419,9 +501,10 @@ class FishingWorker(QThread):
             csv_file = data_dir / 'records.csv'
             file_exists = csv_file.is_file()
             
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            # 记录截图时刻而不是识别完成时刻
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(frame.timestamp))
             
-            with open(csv_file, 'a', encoding='utf-8') as f:
+            with self._records_lock, open(csv_file, 'a', encoding='utf-8') as f:
                 if not file_exists:
                     f.write('Timestamp,Name,Quality,Weight,IsNewRecord\n')
                 
@@ -441,17 +524,18 @@ class FishingWorker(QThread):
         if quality == "传说":
             self.log_updated.emit("哇! 钓到了传说品质的鱼, 正在截图保存...")
             try:
-                with mss.mss() as sct:
-                    timestamp = time.strftime("%Y%m%d_%H%M%S")
-                    filename = cfg._get_base_path() / 'screenshots' / f"legendary_{fish_name.replace(':', '_')}_{timestamp}.png"
-                    sct.shot(output=str(filename))
+                # 使用识别前截取的整屏画面 (回放模式下也不会截到真实桌面)
+                timestamp = time.strftime("%Y%m%d_%H%M%S")
+                filename = cfg._get_base_path() / 'screenshots' / f"legendary_{fish_name.replace(':', '_')}_{timestamp}.png"
+                is_success, buffer = cv2.imencode(".png", cv2.cvtColor(frame.image, cv2.COLOR_BGRA2BGR))
+                if is_success:
+                    with open(filename, 'wb') as f:
+                        f.write(buffer)
                     self.log_updated.emit(f"截图已保存至 {filename}")
+                else:
+                    self.log_updated.emit("截图编码失败。")
             except Exception as e:
                 self.log_updated.emit(f"截图失败: {e}")
-        
-        # 无论结果如何，尝试点击"收起"按钮以关闭弹窗，进入下一轮
-        # 优化：交由主循环统一处理点击，避免此处重复点击导致异常
-        return True
 
 
     def _record_event(self, event_type: str):
@@ -469,7 +553,7 @@ class FishingWorker(QThread):
             
             timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
             
-            with open(csv_file, 'a', encoding='utf-8') as f:
+            with self._records_lock, open(csv_file, 'a', encoding='utf-8') as f:
                 if not file_exists:
                     f.write('Timestamp,Name,Quality,Weight,IsNewRecord\n')
                 # 对于事件，我们只记录名称，其他字段留空，IsNewRecord为No
@@ -547,11 +631,13 @@ class PopupWorker(QThread):
     """
     log_updated = Signal(str)
 
-    def __init__(self):
+    def __init__(self, inputs=None):
         super().__init__()
         self.running = False
         self.vision = vision
-        self.inputs = InputController()
+        self.frame_bus = frame_bus
+        self.planner = planner
+        self.inputs = inputs if inputs is not None else _input_controller()
 
     def run(self):
         """
@@ -563,8 +649,8 @@ class PopupWorker(QThread):
         while self.running:
             try:
                 # --- 加时弹窗检测 ---
-                jiashi_region = cfg.get_rect("jiashi_popup")
-                if self.vision.find_template('chang_grayscale', region=jiashi_region, threshold=0.8):
+                # 若钓鱼线程的最新帧已覆盖该区域则直接复用
+                if self.planner.run("popup")["jiashi_popup"].hit:
                     self.log_updated.emit("检测到加时弹窗，正在处理...")
                     if cfg.enable_jiashi:
                         target_x, target_y = cfg.get_center_anchored_pos(cfg.BTN_JIASHI_YES)
@@ -0,0 +1,101 @@
+import gc
+import tracemalloc
+
+import cv2
+import numpy as np
+import pytest
+
+from src.capture import ImageDirBackend, MssBackend
+from src.config import cfg
+from src.frame_bus import frame_bus
+from src.vision import vision
+
+# Detections per batch; warm-up batches absorb one-time allocations
+# (interpreter caches, per-thread buffers), and the first SETTLE_BATCHES
+# measured ones the measuring loop's own first locals
+BATCH = 100
+WARMUP_BATCHES = 2
+SETTLE_BATCHES = 2
+BATCHES = 6
+
+
+def build_frame(directory):
+    """Writes one full-screen frame with a cast prompt and a bait count of 42."""
+    vision._ensure_loaded()
+    frame = np.zeros((cfg.screen_height, cfg.screen_width, 3), np.uint8)
+
+    def paste(name, rect, x_offset=0):
+        template = vision.templates[name].image
+        h, w = template.shape[:2]
+        x, y = rect[0] + x_offset, rect[1]
+        frame[y:y + h, x:x + w] = template[..., None] if template.ndim == 2 else template[..., :3]
+
+    paste('F1_grayscale', cfg.get_rect('cast_rod'))
+    bait_rect = cfg.get_rect('bait_count')
+    crop_width = int(cfg.BAIT_CROP_WIDTH1_BASE * cfg.scale)
+    paste('4_grayscale', bait_rect)
+    paste('2_grayscale', bait_rect, bait_rect[2] - crop_width)
+    cv2.imwrite(str(directory / 'frame.png'), frame)
+
+
+def detect():
+    """The detections the workers poll while waiting for a bite."""
+    frame = frame_bus.tick(["cast_rod", "cast_rod_ice", "bait_count"])
+    vision.find_template('F1_grayscale', region=cfg.get_rect('cast_rod'), threshold=0.8, frame=frame)
+    vision.find_template('F2_grayscale', region=cfg.get_rect('cast_rod_ice'), threshold=0.8, frame=frame)
+    return vision.get_bait_amount(frame=frame)
+
+
+def buffer_ids():
+    return {key: id(buf) for key, buf in getattr(vision._local, 'buffers', {}).items()}
+
+
+@pytest.fixture
+def replayed_frame(tmp_path):
+    """Replays a synthetic frame with the result caches off, so every detection runs its matcher."""
+    build_frame(tmp_path)
+    max_age, cache_size, gate_threshold = frame_bus.max_age, vision.crop_cache.max_size, vision.change_gate.threshold
+    vision.set_backend(ImageDirBackend(str(tmp_path)))
+    # Frames older than max_age are re-grabbed, which is what the workers see
+    frame_bus.max_age = 0
+    vision.crop_cache.max_size = 0
+    vision.change_gate.threshold = -1
+    yield
+    frame_bus.max_age = max_age
+    vision.crop_cache.max_size = cache_size
+    vision.change_gate.threshold = gate_threshold
+    vision.set_backend(MssBackend())
+
+
+def test_detections_do_not_allocate(replayed_frame):
+    assert detect() == 42
+    buffers = buffer_ids()
+    hits = vision.crop_cache.stats()['hits'] + vision.change_gate.stats()['skips']
+
+    # Preallocated so that recording the measurements doesn't allocate either
+    retained = np.zeros(BATCHES, np.int64)
+    peaks = np.zeros(BATCHES, np.int64)
+    tracemalloc.start()
+    try:
+        for _ in range(WARMUP_BATCHES * BATCH):
+            detect()
+        for batch in range(BATCHES):
+            # Count what is still referenced, not cycles the collector hasn't reached yet
+            gc.collect()
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            for _ in range(BATCH):
+                detect()
+            gc.collect()
+            current, peak = tracemalloc.get_traced_memory()
+            retained[batch] = current - start
+            peaks[batch] = peak - start
+    finally:
+        tracemalloc.stop()
+
+    settled = slice(SETTLE_BATCHES, None)
+    assert not retained[settled].any(), f"memory retained per batch: {retained.tolist()} B"
+    assert peaks[settled].max() == peaks[settled].min(), f"transient peak per batch: {peaks.tolist()} B"
+    assert buffer_ids() == buffers, "Vision allocated new conversion/match buffers after the first detection"
+    assert vision.crop_cache.stats()['hits'] + vision.change_gate.stats()['skips'] == hits, \
+        "detections were answered from a cache instead of a matcher"
@@ -0,0 +1,26 @@
+import pytest
+
+from src.bait_filter import BaitCountFilter
+from src.digit_recognizer import DigitReading
+
+
+def feed(bait_filter, readings):
+    return [bait_filter.update(DigitReading(value, confidence)) for value, confidence in readings]
+
+
+def test_single_misread_never_moves_confirmed_value():
+    bait_filter = BaitCountFilter(votes=2, window=3)
+    assert feed(bait_filter, [(42, 1.0), (42, 1.0), (46, 1.0), (42, 1.0)]) == [None, 42, 42, 42]
+
+
+@pytest.mark.parametrize('votes, window', [(2, 3), (3, 3), (1, 1)])
+def test_marginal_readings_confirm_once_they_fill_the_window(votes, window):
+    bait_filter = BaitCountFilter(votes, window)
+    confirmed = feed(bait_filter, [(41, 0.6)] * window)
+    assert confirmed == [None] * (window - 1) + [41]
+
+
+def test_unreadable_frame_breaks_a_unanimous_window():
+    bait_filter = BaitCountFilter(votes=3, window=3)
+    readings = [(41, 0.6), (None, 0.0), (41, 0.6), (41, 0.6), (41, 0.6)]
+    assert feed(bait_filter, readings) == [None, None, None, None, 41]
@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+import pytest
+
+import src.vision as vision_module
+from src.capture import Frame
+from src.config import cfg
+from src.detectors import DetectorPlanner
+from src.vision import vision
+
+
+class StillFrameBus:
+    """Hands every plan the same synthetic full-screen frame instead of capturing."""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def tick(self, region_names):
+        return self.frame
+
+    def tick_screen(self):
+        return self.frame
+
+
+@pytest.fixture
+def planner():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (cfg.screen_height, cfg.screen_width, 4), dtype=np.uint8)
+    frame = Frame(image, (0, 0, cfg.screen_width, cfg.screen_height), time.time())
+    vision.crop_cache.clear()
+    vision.change_gate.clear()
+    yield DetectorPlanner(vision, StillFrameBus(frame))
+    vision.set_match_threads(0)
+    vision.crop_cache.clear()
+    vision.change_gate.clear()
+
+
+def test_multi_region_plan_fans_out_to_match_pool(planner, monkeypatch):
+    plan = planner.plan_for("reeling_in")
+    assert len(plan.region_names) > 1
+    serial = {name: (match.score, match.hit) for name, match in planner.run("reeling_in", track=False).items()}
+
+    monkeypatch.setattr(vision_module, 'PARALLEL_MIN_PIXELS', 0)
+    vision.set_match_threads(2)
+    vision.crop_cache.clear()
+    vision.change_gate.clear()
+    submitted = []
+    submit = vision.executor.submit
+    monkeypatch.setattr(vision.executor, 'submit', lambda *args: submitted.append(args) or submit(*args))
+
+    parallel = {name: (match.score, match.hit) for name, match in planner.run("reeling_in", track=False).items()}
+    assert len(submitted) > 1
+    assert parallel == serial
+
+
+def test_full_screen_templates_split_across_match_pool(planner, monkeypatch):
+    serial = {name: (match.score, match.center) for name, match in planner.run("precheck", track=False).items()
+              if name != "bait_count"}
+
+    vision.set_match_threads(2)
+    vision.crop_cache.clear()
+    vision.change_gate.clear()
+    submitted = []
+    submit = vision.executor.submit
+    monkeypatch.setattr(vision.executor, 'submit', lambda *args: submitted.append(args) or submit(*args))
+
+    parallel = planner.run("precheck", track=False)
+    assert len(submitted) == len(planner.plan_for("precheck").queries)
+    assert {name: (parallel[name].score, parallel[name].center) for name in serial} == serial
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import cv2
+import pytest
+
+from src import layout
+from src.config import cfg
+
+SCREENSHOT = Path(__file__).parent.parent / 'docs' / 'images' / 'visual_debug_20260109_013910.png'
+
+
+@pytest.fixture
+def capture():
+    """The screenshot in grayscale, with cfg's screen size restored afterwards."""
+    width, height = cfg.screen_width, cfg.screen_height
+    yield cv2.imread(str(SCREENSHOT), cv2.IMREAD_GRAYSCALE)
+    cfg.set_screen_size(width, height)
+
+
+def calibrated(image):
+    cfg.set_screen_size(image.shape[1], image.shape[0])
+    profile = layout.calibrate(image)
+    assert profile is not None
+    return profile.scale, profile.offset_x, profile.offset_y, profile.anchors
+
+
+def test_screenshot_calibrates_to_default_layout(capture):
+    assert calibrated(capture) == (1.0, 0, 0, 1)
+
+
+def test_downscaled_screenshot_keeps_resolution_scale(capture):
+    assert calibrated(cv2.resize(capture, (1920, 1080), interpolation=cv2.INTER_AREA)) == (0.75, 0, 0, 1)
+
+
+def test_bite_and_cast_prompts_are_separate_anchors(capture):
+    # Copy the cast prompt to where the bite prompt shows
+    x, y, w, h = cfg.get_rect('cast_rod')
+    bite_x, bite_y, _, _ = cfg.get_rect('wait_bite')
+    capture[bite_y:bite_y + h, bite_x:bite_x + w] = capture[y:y + h, x:x + w]
+    assert calibrated(capture) == (1.0, 0, 0, 2)
+
+
+def test_expected_centers_match_regions_without_touching_cfg(capture):
+    cfg.set_screen_size(1920, 1080)
+    state = (cfg.scale, cfg.scale_x, cfg.scale_y, cfg.layout_offset)
+    centers = layout._expected_centers(0.9)
+    assert (cfg.scale, cfg.scale_x, cfg.scale_y, cfg.layout_offset) == state
+
+    # cfg truncates positions and sizes to whole pixels
+    cfg.apply_layout(0.9)
+    for (cx, cy), name in zip(centers, layout.ANCHOR_REGIONS):
+        x, y, w, h = cfg.get_rect(name)
+        assert abs(cx - (x + w / 2)) <= 1.5 and abs(cy - (y + h / 2)) <= 1.5
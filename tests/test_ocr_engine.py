@@ -0,0 +1,46 @@
+import pytest
+
+import src.ocr_engine as ocr_engine_module
+from src.config import cfg
+from src.ocr_engine import build_engine
+
+
+class OpaqueRapidOCR:
+    """A RapidOCR whose internals don't have the rapidocr_onnxruntime 1.x layout."""
+
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        OpaqueRapidOCR.instances.append(self)
+
+
+@pytest.fixture
+def opaque_rapidocr(monkeypatch):
+    OpaqueRapidOCR.instances = []
+    monkeypatch.setattr(ocr_engine_module, 'RapidOCR', OpaqueRapidOCR)
+    monkeypatch.setitem(cfg.global_settings, "ocr_session", {})
+    monkeypatch.setitem(cfg.global_settings, "ocr_rec_model", "")
+    return OpaqueRapidOCR
+
+
+def test_unconfigured_engine_is_left_as_built(opaque_rapidocr):
+    engine = build_engine()
+    assert opaque_rapidocr.instances == [engine]
+    assert engine.kwargs == {}
+
+
+def test_unknown_internals_fall_back_to_rebuilding_with_thread_counts(opaque_rapidocr):
+    engine = build_engine({"intra_op_threads": 1, "cpu_mem_arena": True})
+    assert len(opaque_rapidocr.instances) == 2
+    assert engine is opaque_rapidocr.instances[-1]
+    assert engine.kwargs == {"intra_op_num_threads": 1, "inter_op_num_threads": -1}
+
+
+def test_installed_rapidocr_sessions_are_rebuilt(monkeypatch):
+    monkeypatch.setitem(cfg.global_settings, "ocr_rec_model", "")
+    engine = build_engine({"intra_op_threads": 1})
+    sessions = ocr_engine_module._session_wrappers(engine)
+    assert sessions is not None
+    for infer, _ in sessions:
+        assert infer.session.get_session_options().intra_op_num_threads == 1
@@ -0,0 +1,63 @@
+import time
+from pathlib import Path
+
+import cv2
+import pytest
+
+from src.capture import Frame
+from src.config import cfg
+from src.vision import vision
+
+SCREENSHOT = Path(__file__).parent.parent / 'docs' / 'images' / 'visual_debug_20260109_013910.png'
+# Center of the F1 prompt in the screenshot
+F1_CENTER = (1104, 1339)
+
+
+@pytest.fixture
+def screen():
+    """The screenshot as a full-screen BGRA frame source, with the result caches cleared."""
+    image = cv2.cvtColor(cv2.imread(str(SCREENSHOT)), cv2.COLOR_BGR2BGRA)
+    width, height = cfg.screen_width, cfg.screen_height
+    cfg.set_screen_size(image.shape[1], image.shape[0])
+    vision.change_gate.clear()
+    vision.crop_cache.clear()
+    yield image
+    cfg.set_screen_size(width, height)
+    vision.change_gate.clear()
+    vision.crop_cache.clear()
+
+
+def full_frame(image):
+    return Frame(image, (0, 0, image.shape[1], image.shape[0]), time.time())
+
+
+def hide_prompt(image):
+    """Paints the F1 prompt over with the background row above it."""
+    template = vision.get_template('F1_grayscale')
+    x, y = F1_CENTER
+    hidden = image.copy()
+    left, right = x - template.width, x + template.width
+    top, bottom = y - template.height, y + template.height
+    hidden[top:bottom, left:right] = hidden[top - 40:top - 39, left:right]
+    return hidden
+
+
+def test_full_screen_search_sees_prompt_appear(screen):
+    assert vision.find_template('F1_grayscale', None, 0.8, frame=full_frame(hide_prompt(screen))) is None
+
+    skips = vision.change_gate.stats()['skips']
+    assert vision.find_template('F1_grayscale', None, 0.8, frame=full_frame(screen.copy())) == F1_CENTER
+    assert vision.change_gate.stats()['skips'] == skips
+
+
+def test_region_search_still_gated(screen):
+    region = cfg.get_rect('cast_rod')
+    frame = full_frame(screen)
+    first = vision.find_template('F1_grayscale', region, 0.8, frame=frame)
+
+    # Capture noise: not pixel-identical, but not a visible change either
+    noisy = screen.copy()
+    noisy[..., 0] ^= 1
+    skips = vision.change_gate.stats()['skips']
+    assert vision.find_template('F1_grayscale', region, 0.8, frame=full_frame(noisy)) == first
+    assert vision.change_gate.stats()['skips'] == skips + 1
@@ -0,0 +1,67 @@
+"""
+Measures the game's UI scale and offset from a full-screen capture showing
+the F1/F2 cast or bite prompt, and stores it as the layout profile for that
+resolution (config.json "layouts"), which replaces the scale derived from the
+screen size on later runs.
+
+Without a screenshot the primary monitor is captured live.
+
+Run from the project root:
+    python -m tools.calibrate_layout [screenshot.png] [--write]
+    python -m tools.calibrate_layout --clear 1920x1080
+"""
+import argparse
+import sys
+import time
+
+import cv2
+
+from src import layout
+from src.config import cfg
+from src.vision import vision
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('screenshot', nargs='?', help="full-screen capture; default captures the screen")
+    parser.add_argument('--min-score', type=float, default=layout.MIN_SCORE)
+    parser.add_argument('--write', action='store_true', help="store the profile in config.json")
+    parser.add_argument('--clear', metavar='WxH', help="remove the stored profile of a resolution")
+    args = parser.parse_args()
+
+    if args.clear:
+        if cfg.layout_profiles.pop(args.clear, None) is None:
+            parser.error(f"no layout profile for {args.clear}")
+        cfg.save()
+        print(f"Removed the layout profile for {args.clear}")
+        return 0
+
+    if args.screenshot:
+        img = cv2.imread(args.screenshot)
+        if img is None:
+            parser.error(f"cannot read {args.screenshot}")
+        cfg.set_screen_size(img.shape[1], img.shape[0])
+        image = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    else:
+        image = vision.grab_frame(None).image
+
+    print(f"Default layout for {cfg.layout_key()}: scale {cfg.screen_height / cfg.BASE_SCREEN_HEIGHT:.3f}, offset (0, 0)")
+    start = time.perf_counter()
+    profile = layout.calibrate(image, args.min_score)
+    elapsed = time.perf_counter() - start
+    if profile is None:
+        print(f"No anchor scored {args.min_score:.2f} or more ({elapsed:.2f} s); "
+              "capture the screen while the F1/F2 prompt is visible.")
+        return 1
+
+    print(f"Calibrated in {elapsed:.2f} s: scale {profile.scale:.3f}, "
+          f"offset ({profile.offset_x}, {profile.offset_y}), score {profile.score:.3f}, "
+          f"{profile.anchors} anchor(s)")
+    if args.write:
+        layout.apply_profile(profile)
+        print(f"Layout profile for {profile.key} written to config/config.json")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
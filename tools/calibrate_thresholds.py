@@ -0,0 +1,265 @@
+"""
+Offline threshold calibration for the detector registry (Config.DETECTORS).
+
+Scores every labeled (frame, detector) pair of a corpus on a multiprocessing
+pool, builds a ROC curve per template detector and recommends the threshold
+that best separates positives from negatives. The bait counter's threshold
+decides which digit cells are read at all, so it is re-read at every
+candidate threshold instead and the one reading the most counts right wins.
+With --write the recommendations are stored as per-detector overrides in
+config/config.json. The JSON report (--report) doubles as an accuracy
+regression baseline (--baseline) when templates or matching code change.
+
+The corpus is a directory of full-screen PNG captures plus a labels.csv with
+the columns file,detector,label:
+  - template detectors: label is 1 (icon present) or 0 (absent)
+  - the "digits" detector (bait_count): label is the count shown, or "none"
+
+Run from the project root:
+    python -m tools.calibrate_thresholds <corpus-dir> [--jobs 8] [--write]
+    python -m tools.calibrate_thresholds <corpus-dir> --report new.json --baseline old.json
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+from src.capture import Frame
+from src.config import cfg
+from src.vision import vision
+
+# Corpus directory, set in each pool process by _init_worker
+_corpus = None
+
+# Candidate thresholds the bait counter is re-read at (plus its current one)
+DIGIT_THRESHOLD_GRID = np.round(np.arange(0.30, 1.0, 0.01), 2)
+
+
+def digit_thresholds(name):
+    return np.unique(np.r_[DIGIT_THRESHOLD_GRID, cfg.get_detector(name)["threshold"]])
+
+
+def load_labels(corpus):
+    """Returns [(file, [(detector, label), ...]), ...] grouped by frame."""
+    frames = defaultdict(list)
+    with open(os.path.join(corpus, 'labels.csv'), newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            frames[row['file']].append((row['detector'], row['label'].strip()))
+    return sorted(frames.items())
+
+
+def _init_worker(corpus, screen_size):
+    # Each process scores frames independently: no result caches, no tracking
+    global _corpus
+    _corpus = corpus
+    cfg.set_screen_size(*screen_size)
+    vision.load_templates()
+    vision.crop_cache.max_size = 0
+    vision.change_gate.threshold = -1
+
+
+def _score_frame(item):
+    """
+    Scores one frame; returns [(detector, label, score, correct)]. For the
+    digits detector score is None and correct holds one verdict per
+    digit_thresholds() entry.
+    """
+    file, labels = item
+    img = cv2.imread(os.path.join(_corpus, file))
+    if img is None:
+        return []
+    image = cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+    frame = Frame(image, (0, 0, image.shape[1], image.shape[0]), time.time())
+
+    results = []
+    for name, label in labels:
+        detector = cfg.get_detector(name)
+        region = cfg.get_rect(detector["region"]) if detector["region"] is not None else None
+        if detector.get("method", "template") == "digits":
+            expected = None if label.lower() == 'none' else int(label)
+            correct = [vision.read_bait_count(region, threshold, frame).value == expected
+                       for threshold in digit_thresholds(name)]
+            results.append((name, label, None, correct))
+        else:
+            match = vision.find_templates([(detector["template"], region, 0.0)], frame=frame)[0]
+            results.append((name, label, match.score, label == '1'))
+    return results
+
+
+def roc(scores, positive):
+    """
+    ROC points for "score >= threshold" as (thresholds, tpr, fpr), thresholds
+    descending, plus the area under the curve.
+    """
+    order = np.argsort(-scores, kind='stable')
+    scores, positive = scores[order], positive[order]
+    n_pos = max(int(positive.sum()), 1)
+    n_neg = max(int((~positive).sum()), 1)
+    tp = np.cumsum(positive)
+    fp = np.cumsum(~positive)
+    # Only the last index of tied scores is a valid cut
+    last = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    thresholds, tpr, fpr = scores[last], tp[last] / n_pos, fp[last] / n_neg
+    # Trapezoidal area, starting from (0, 0)
+    x, y = np.r_[0.0, fpr], np.r_[0.0, tpr]
+    auc = float(np.sum(np.diff(x) * (y[1:] + y[:-1]) / 2))
+    return thresholds, tpr, fpr, auc
+
+
+def recommend(scores, positive):
+    """
+    Threshold with the best TPR - FPR. When positives and negatives separate
+    completely, the midpoint of the gap leaves the most margin on both sides.
+    """
+    if positive.all() or not positive.any():
+        return None
+    highest_negative = scores[~positive].max()
+    lowest_positive = scores[positive].min()
+    if lowest_positive > highest_negative:
+        return float((lowest_positive + highest_negative) / 2)
+    thresholds, tpr, fpr, _ = roc(scores, positive)
+    return float(thresholds[np.argmax(tpr - fpr)])
+
+
+def accuracy(scores, positive, threshold):
+    if threshold is None:
+        return None
+    return float(((scores >= threshold) == positive).mean())
+
+
+def summarize_digits(name, labels, correct, current):
+    """Report for the digits detector from its per-threshold verdicts (frames x thresholds)."""
+    thresholds = digit_thresholds(name)
+    rates = np.asarray(correct, bool).mean(axis=0)
+    # Middle of the widest run of best thresholds leaves the most margin
+    best = np.flatnonzero(rates == rates.max())
+    runs = np.split(best, np.flatnonzero(np.diff(best) > 1) + 1)
+    widest = max(runs, key=len)
+    recommended = widest[len(widest) // 2]
+    counted = sum(label.lower() != 'none' for label in labels)
+    return {
+        'positives': counted,
+        'negatives': len(labels) - counted,
+        'auc': None,
+        'current_threshold': current,
+        'current_accuracy': float(rates[np.flatnonzero(np.isclose(thresholds, current))[0]]) if current is not None else None,
+        'recommended_threshold': float(thresholds[recommended]),
+        'recommended_accuracy': float(rates[recommended]),
+        'lowest_positive': None,
+        'highest_negative': None,
+    }
+
+
+def summarize(samples, current_thresholds):
+    """Per-detector report from [(detector, label, score, correct)]."""
+    by_detector = defaultdict(list)
+    digits = defaultdict(list)
+    for name, label, score, correct in samples:
+        if score is None:
+            digits[name].append((label, correct))
+        else:
+            by_detector[name].append((score, correct))
+
+    report = {}
+    for name, values in sorted(digits.items()):
+        report[name] = summarize_digits(name, [label for label, _ in values], [c for _, c in values],
+                                        current_thresholds.get(name))
+    for name, values in sorted(by_detector.items()):
+        scores = np.array([s for s, _ in values], np.float64)
+        positive = np.array([c for _, c in values], bool)
+        _, _, _, auc = roc(scores, positive)
+        recommended = recommend(scores, positive)
+        current = current_thresholds.get(name)
+        report[name] = {
+            'positives': int(positive.sum()),
+            'negatives': int((~positive).sum()),
+            'auc': auc,
+            'current_threshold': current,
+            'current_accuracy': accuracy(scores, positive, current),
+            'recommended_threshold': recommended,
+            'recommended_accuracy': accuracy(scores, positive, recommended),
+            'lowest_positive': float(scores[positive].min()) if positive.any() else None,
+            'highest_negative': float(scores[~positive].max()) if (~positive).any() else None,
+        }
+    return dict(sorted(report.items()))
+
+
+def print_report(report, baseline=None):
+    print(f"{'detector':<16} {'pos':>5} {'neg':>5} {'AUC':>6} {'current':>15} {'recommended':>15}")
+    regressions = []
+    for name, r in report.items():
+        current = "-" if r['current_accuracy'] is None else f"{r['current_threshold']:.3f} {r['current_accuracy']:.1%}"
+        recommended = "-" if r['recommended_threshold'] is None else f"{r['recommended_threshold']:.3f} {r['recommended_accuracy']:.1%}"
+        auc = "-" if r['auc'] is None else f"{r['auc']:.3f}"
+        line = f"{name:<16} {r['positives']:>5} {r['negatives']:>5} {auc:>6} {current:>15} {recommended:>15}"
+        old = (baseline or {}).get(name)
+        if old and old.get('current_accuracy') is not None and r['current_accuracy'] is not None:
+            delta = r['current_accuracy'] - old['current_accuracy']
+            line += f"  ({delta:+.1%} vs baseline)"
+            if delta < 0:
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('corpus', help="directory with the frames and labels.csv")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument('--write', action='store_true', help="store recommended thresholds in config.json")
+    parser.add_argument('--report', help="write the per-detector report to this JSON file")
+    parser.add_argument('--baseline', help="earlier --report to compare accuracy against")
+    args = parser.parse_args()
+
+    frames = load_labels(args.corpus)
+    if not frames:
+        parser.error("labels.csv has no rows")
+    first = cv2.imread(os.path.join(args.corpus, frames[0][0]))
+    if first is None:
+        parser.error(f"cannot read {frames[0][0]}")
+    screen_size = (first.shape[1], first.shape[0])
+
+    start = time.perf_counter()
+    samples = []
+    with multiprocessing.Pool(args.jobs, _init_worker, (args.corpus, screen_size)) as pool:
+        for results in pool.imap_unordered(_score_frame, frames, chunksize=16):
+            samples.extend(results)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {len(samples)} labels on {len(frames)} frames "
+          f"({screen_size[0]}x{screen_size[1]}) in {elapsed:.1f} s with {args.jobs} processes")
+
+    current = {name: cfg.get_detector(name)["threshold"] for name in cfg.DETECTORS}
+    report = summarize(samples, current)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    regressions = print_report(report, baseline)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.write:
+        for name, r in report.items():
+            if r['recommended_threshold'] is not None:
+                cfg.detector_overrides.setdefault(name, {})["threshold"] = round(r['recommended_threshold'], 3)
+        cfg.save()
+        print("Recommended thresholds written to config/config.json")
+
+    if regressions:
+        print(f"Accuracy regressed for: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
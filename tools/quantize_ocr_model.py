@@ -0,0 +1,83 @@
+"""
+Writes a dynamically int8-quantized copy of RapidOCR's bundled recognition
+model, for config.json global_settings["ocr_rec_model"].
+
+The Paddle export keeps its weights in Constant nodes, so the model is first
+run through ONNX Runtime's quantization pre-processing (constant folding,
+shape inference), which turns them into quantizable initializers. Only
+MatMul/Gemm weights are quantized by default: dynamic quantization of the
+convolutions (--op-types Conv MatMul Gemm) garbles the recognized text.
+Compare a model against the bundled one with benchmarks.bench_ocr_quantized
+before switching to it.
+
+Works offline from the installed rapidocr_onnxruntime models; needs the
+onnx package (pip install onnx), which only this tool uses.
+
+Run from the project root:
+    python -m tools.quantize_ocr_model [--output models/rec.int8.onnx] [--op-types MatMul Gemm]
+        [--per-channel] [--write]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import rapidocr_onnxruntime
+
+from src.config import cfg
+
+BUNDLED_REC_MODEL = Path(rapidocr_onnxruntime.__file__).parent / 'models' / 'ch_PP-OCRv4_rec_infer.onnx'
+DEFAULT_OUTPUT = Path('models') / f"{BUNDLED_REC_MODEL.stem}.int8.onnx"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', default=str(BUNDLED_REC_MODEL), help="fp32 recognition model")
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT),
+                        help="relative paths are inside the application directory")
+    parser.add_argument('--op-types', nargs='+', default=['MatMul', 'Gemm'], help="operators to quantize")
+    parser.add_argument('--per-channel', action='store_true', help="one scale per output channel")
+    parser.add_argument('--write', action='store_true', help="set ocr_rec_model in config.json")
+    args = parser.parse_args()
+
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        from onnxruntime.quantization.shape_inference import quant_pre_process
+    except ImportError as e:
+        print(f"ONNX Runtime quantization is unavailable ({e}); install it with: pip install onnx")
+        return 1
+
+    source = Path(args.source)
+    if not source.exists():
+        parser.error(f"{source} not found")
+    output = Path(args.output)
+    if not output.is_absolute():
+        output = cfg._get_base_path() / output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if 'Conv' in args.op_types:
+        print("Warning: dynamically quantized convolutions lose most of the recognition accuracy")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prepared = os.path.join(tmp, 'prepared.onnx')
+        quant_pre_process(str(source), prepared, skip_symbolic_shape=True)
+        quantize_dynamic(prepared, str(output), op_types_to_quantize=args.op_types,
+                         per_channel=args.per_channel, weight_type=QuantType.QInt8)
+
+    print(f"{source.name}: {source.stat().st_size / 1e6:.1f} MB -> "
+          f"{output.name}: {output.stat().st_size / 1e6:.1f} MB ({', '.join(args.op_types)} int8)")
+    if args.write:
+        try:
+            setting = str(output.relative_to(cfg._get_base_path()))
+        except ValueError:
+            setting = str(output)
+        cfg.global_settings["ocr_rec_model"] = setting
+        cfg.save()
+        print(f"ocr_rec_model set to {setting} in config/config.json")
+    else:
+        print(f"Set global_settings.ocr_rec_model to {output} in config/config.json to use it")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())